@@ -1,262 +1,563 @@
-from board import Board
-import random
-
-class AIVersions():
-    """ A class to represent AIs for a chessgame.
-
-    Methods
-    -------
-    choice() --> !!!NO LONGER SUPPORTED!!!
-        makes a random move for a player
-    minimax(max_turn, max_depth, board, depth=0)
-        returns best score for a player and updates teh best move instance variable
-    get_idx_piece(piece)
-        returns the list the piece is in and the index
-    """
-
-    def __init__(self):
-        self.best_move = None
-
-    def choice(self, player, board):
-        """ Makes a random move from the possible moves list.
-
-        !!!NO LONGER SUPPORTED!!!
-
-        Parameters
-        ----------
-        player : bool
-            list of original piece object and the new location
-        board : board.Board
-            the Board object that stores the matrix for the game
-        """
-
-        #White player and black player turns
-        if player:
-            choices = board.turn_moves_w()
-
-        else:
-            choices = board.turn_moves_b()
-
-        self.best_move = random.choice(choices)     #random move choice
-
-        #If the move involves a pawn, ensure that the first move is declared
-        if type(self.best_move[0]).__name__ == 'Pawn':
-            if self.best_move[0].first_move:
-                self.best_move[0].first_move = False
-
-        #Updates the piece location and the board
-        self.best_move[0].update(self.best_move[1][0], self.best_move[1][1], board)
-    
-    def minimax(self, max_turn, max_depth, board, depth=0):
-        """ Chooses the best move to make with the Minimax algorithm.
-            
-        Parameters
-        ----------
-        max_turn : bool
-            True for the max player, False for the min player
-        max_depth : int
-            how many moves the AI will look ahead
-        board : board.Board
-            the Board object that stores the matrix for the game
-        depth : int, optional
-            the starting depth (default is 0)
-
-        Returns
-        -------
-        int
-            the best score that the player can achieve
-        """
-
-        #The max look ahead depth is reached, return the score
-        if depth == max_depth:
-            return board.evaluate_score()
-
-        #If max player turn (TRUE BOOLEAN)
-        elif max_turn:
-            best_score = float('-inf')
-
-            #----- Check for King in check -----
-            check, safe = board.in_check(max_turn)
-            if check:
-                choices = [[board.wp[0], sm] for sm in safe]
-            else:
-                choices = board.turn_moves_w()
-            #------------------------------------
-
-            for idx in range(len(choices)):
-                #call to clone pieces and make a move
-                real = board.clone_move(choices[idx])
-
-                #store the score from the recursive call
-                possible_score = self.minimax(False, max_depth, board, depth + 1)
-                
-                #store the score and move_idx if it is more than the best score
-                if possible_score > best_score:
-                    best_score = possible_score
-
-                    #Only update the best move if it is white turn
-                    if depth == 0:
-                        self.best_move = choices[idx]
-
-                board.reset_lists(real)     #undo the move
-
-        #else: min player turn (FALSE BOOLEAN)
-        else:
-            best_score = float('inf')
-
-            #----- Check for King in check -----
-            check, safe = board.in_check(max_turn)
-            if check:
-                choices = [[board.bp[0], sm] for sm in safe]
-            else:
-                choices = board.turn_moves_b()
-            #------------------------------------
-
-            for idx in range(len(choices)):
-                #call to clone pieces and make a move
-                real = board.clone_move(choices[idx])
-
-                #store the score from the recursive call
-                possible_score = self.minimax(True, max_depth, board, depth + 1)
-                
-                #store the score and move_idx if it is less than the best score
-                if possible_score < best_score:
-                    best_score = possible_score
-
-                    #Only update the best move if it is black turn
-                    if depth == 0:
-                        self.best_move = choices[idx]
-
-                board.reset_lists(real)     #undo the move
-        
-        return best_score   #Best score for that board
-
-    def make_best_move(self, board):
-        """ Makes the best move found by the AI.
-
-        Parameters
-        ----------
-        board : board.Board
-            the Board object that stores the matrix for the game
-        """
-
-        piece, spot = self.best_move
-
-        #Print the move in the console
-        print('{} {} will move from {} to {}' \
-                .format("White" if piece.white else "Black", \
-                type(piece).__name__, \
-                piece.location, spot))
-
-        #If the move involves a pawn, ensure that the first move is declared
-        if type(piece).__name__ == 'Pawn':
-            if piece.first_move:
-                piece.first_move = False
-
-        #Updates the piece location and the board
-        piece.update(spot[0], spot[1], board)
-
-    def alpha_beta_pruning(self, max_turn, max_depth, board, alpha=float('-inf'), beta=float('inf'), depth=0):
-        """ Chooses the best move to make with the addition of alph-beta pruning.
-            
-        Parameters
-        ----------
-        max_turn : bool
-            True for the max player, False for the min player
-        max_depth : int
-            how many moves the AI will look ahead
-        board : board.Board
-            the Board object that stores the matrix for the game
-        alpha : int, optional
-            used to prune (default is -inf)
-        beta : int, optional
-            used to prune (default is inf)            
-        depth : int, optional
-            the starting depth (default is 0)
-
-        Returns
-        -------
-        int
-            the best score that the player can achieve
-        """
-            
-        #The max look ahead depth is reached, return the score
-        if depth == max_depth:
-            return board.evaluate_score()
-
-        #If max player turn (TRUE BOOLEAN)
-        elif max_turn:
-            best_score = float('-inf')
-
-            #----- Check for King in check -----
-            check, safe = board.in_check(max_turn)
-            if check:
-                choices = [[board.wp[0], sm] for sm in safe]
-            else:
-                choices = board.turn_moves_w()
-            #------------------------------------
-
-            for idx in range(len(choices)):
-                #call to clone pieces and make a move
-                real = board.clone_move(choices[idx])
-
-                #store the score from the recursive call
-                possible_score = self.alpha_beta_pruning(False, max_depth, board, alpha, beta, depth + 1)
-                
-                #store the score and move_idx if it is more than the best score
-                if possible_score > best_score:
-                    best_score = possible_score
-
-                    #Only update the best move if it is white turn
-                    if depth == 0:
-                        self.best_move = choices[idx]
-
-                #if higher score, best alpha is now best
-                if best_score > alpha:
-                    alpha = best_score
-
-                board.reset_lists(real) #undo the move
-
-                #there is already a better move
-                if beta <= alpha:
-                    break
-
-        #else: min player turn (FALSE BOOLEAN)
-        else:
-            best_score = float('inf')
-
-            #----- Check for King in check -----
-            check, safe = board.in_check(max_turn)
-            if check:
-                choices = [[board.bp[0], sm] for sm in safe]
-            else:
-                choices = board.turn_moves_b()
-            #------------------------------------
-
-            for idx in range(len(choices)):
-                #call to clone pieces and make a move
-                real = board.clone_move(choices[idx])
-
-                #store the score from the recursive call
-                possible_score = self.alpha_beta_pruning(True, max_depth, board, alpha, beta, depth + 1)
-                
-                #store the score and move_idx if it is less than the best score
-                if possible_score < best_score:
-                    best_score = possible_score
-
-                    #Only update the best move if it is black turn
-                    if depth == 0:
-                        self.best_move = choices[idx]
-
-                #if lower score, best beta is now best
-                if best_score < beta:
-                    beta = best_score
-
-                board.reset_lists(real) #undo the move
-
-                #there is already a better move
-                if beta <= alpha:
-                    break
-        
-        return best_score   #Best score for that board
-    
\ No newline at end of file
+from board import Board
+from bitboard import COORDS, decode_move
+from transposition import TranspositionTable
+from move_ordering import MoveOrderer
+from negamax import SearchContext, negamax, null_move_prune, late_move_reduction
+from errors import SearchTimeout
+from search_stats import SearchStats
+import random
+import time
+
+ASPIRATION_WINDOW = 50  #Half width of the first root window around the last score
+ASPIRATION_LIMIT = 800  #Windows wider than this are opened all the way
+
+class AIVersions():
+    """ A class to represent AIs for a chessgame.
+
+    Attributes
+    ----------
+    best_move : int
+        the best move found packed by bitboard.encode_move (None if the
+        player has no moves)
+    pv : list
+        the principal variation of the last search from the root, the
+        best moves of both players, searched first by the next search
+    pv_key : int
+        Zobrist key of the position pv starts from (None before a search)
+    tt : transposition.TranspositionTable
+        table of searched positions kept between moves (None if disabled)
+    orderer : move_ordering.MoveOrderer
+        sorts the alpha-beta moves with the best moves first (None if disabled)
+    nodes : int
+        the number of positions visited by the searches
+    q_budget : int
+        the most quiescence positions each alpha-beta search may visit
+        (0 if quiescence is disabled)
+    q_nodes : int
+        the number of quiescence positions visited by the current search
+    cutoffs : int
+        the number of alpha-beta cutoffs
+    first_cutoffs : int
+        the number of alpha-beta cutoffs caused by the first move searched
+    pvs : bool
+        search all but the first move of a position with a zero window,
+        and the root of each deeper search with an aspiration window
+    researches : int
+        the number of zero window, aspiration and reduced searches that
+        had to be searched again
+    null_move : bool
+        skip a turn and prune the position when the player still wins,
+        unless the player is in check or only has Pawns and the King
+    lmr : bool
+        search late quiet moves less deeply unless they beat alpha
+    evaluate : function
+        evaluation hook, evaluate(board) returns the score of a position
+        positive when the white player is ahead
+    pruners : list
+        pruning hooks tried after the null move, see negamax.SearchContext
+    reduction : function
+        reduction hook used when lmr is on, see negamax.SearchContext
+    depth_log : list
+        (depth, nodes, quiescence nodes, seconds, principal variation) of
+        each depth finished by the last iterative_deepening call
+    stats_log : file object
+        stream the statistics of each search are written to as JSON lines
+        (None if they are not written)
+    deadline : float
+        time.perf_counter() value when a timed search must stop (None if
+        the search is not timed)
+    stop : multiprocessing.Value
+        shared flag that stops the search of a helper process when it is
+        set (None if the search is not stopped by another process)
+
+    Methods
+    -------
+    choice() --> !!!NO LONGER SUPPORTED!!!
+        makes a random move for a player
+    minimax(max_turn, max_depth, board, depth=0)
+        returns best score for a player and updates teh best move instance variable
+    make_best_move(board)
+        makes the best move found by the AI
+    search(max_turn, board, max_depth=None, time_budget=None, minimax=False)
+        returns the statistics of a search for the best move
+    alpha_beta_pruning(max_turn, max_depth, board, alpha, beta, depth=0)
+        returns best score for a player with alpha-beta pruning
+    context(minimax=False, follow=())
+        returns the context for one search with the settings and hooks
+    follow_line(board)
+        returns the part of the last principal variation left to play
+    run(ctx, max_turn, max_depth, board, alpha, beta, depth)
+        returns the best score of a negamax search and keeps its counts
+    aspiration_search(max_turn, max_depth, board, guess)
+        returns the best score from searches with a window around a guess
+    iterative_deepening(max_turn, time_budget, board, max_depth=64, search=None)
+        returns the best score from the deepest search that finished in time
+    """
+
+    def __init__(self, tt_size_mb=16, ordering=True, seed=None, q_budget=50000, tt=None, \
+        stats_log=None, pvs=True, null_move=True, lmr=True, evaluate=None, pruners=None, \
+        reduction=None):
+        """
+        Parameters
+        ----------
+        tt_size_mb : int, optional
+            memory for the alpha-beta transposition table in megabytes,
+            0 turns the table off (default is 16)
+        ordering : bool, optional
+            sort the alpha-beta moves before searching them (default is True)
+        seed : int, optional
+            seed for breaking ties between equally ordered moves (default is None)
+        q_budget : int, optional
+            the most quiescence positions each alpha-beta search may visit,
+            0 turns quiescence off (default is 50000)
+        tt : transposition.TranspositionTable, optional
+            an existing table to use, such as a SharedTranspositionTable,
+            instead of creating one with tt_size_mb (default is None)
+        stats_log : file object, optional
+            stream to write the statistics of each search made with search()
+            to as JSON lines (default is None)
+        pvs : bool, optional
+            use principal variation search and aspiration windows in the
+            alpha-beta search (default is True)
+        null_move : bool, optional
+            use null move pruning in the alpha-beta search (default is True)
+        lmr : bool, optional
+            use late move reductions in the alpha-beta search (default is True)
+        evaluate : function, optional
+            evaluation hook (default is Board.evaluate_score)
+        pruners : list, optional
+            extra pruning hooks for the alpha-beta search (default is None)
+        reduction : function, optional
+            reduction hook for lmr (default is negamax.late_move_reduction)
+        """
+
+        self.best_move = None
+        self.pv = []
+        self.pv_key = None
+        if tt is None and tt_size_mb:
+            tt = TranspositionTable(tt_size_mb)
+        self.tt = tt
+        self.orderer = MoveOrderer(seed) if ordering else None
+
+        self.nodes = 0
+        self.deadline = None    #Only set during iterative_deepening
+        self.stop = None        #Only set in Lazy SMP helper processes
+
+        self.q_budget = q_budget
+        self.q_nodes = 0
+
+        self.cutoffs = 0
+        self.first_cutoffs = 0
+        self.pvs = pvs
+        self.null_move = null_move
+        self.lmr = lmr
+        self.researches = 0
+
+        self.evaluate = evaluate or Board.evaluate_score
+        self.pruners = list(pruners or [])
+        self.reduction = reduction or late_move_reduction
+
+        self.depth_log = []
+        self.stats_log = stats_log
+
+    def choice(self, player, board):
+        """ Makes a random move from the possible moves list.
+
+        !!!NO LONGER SUPPORTED!!!
+
+        Parameters
+        ----------
+        player : bool
+            list of original piece object and the new location
+        board : board.Board
+            the Board object that stores the matrix for the game
+        """
+
+        #White player and black player turns
+        if player:
+            choices = board.turn_moves_w()
+
+        else:
+            choices = board.turn_moves_b()
+
+        self.best_move = random.choice(choices)     #random move choice
+        frm, to = decode_move(self.best_move)
+
+        #Updates the piece location and the board, Pawns lose their first move there
+        x, y = COORDS[to]
+        board.squares[frm].update(x, y, board)
+    
+    def minimax(self, max_turn, max_depth, board, depth=0):
+        """ Chooses the best move to make with the Minimax algorithm.
+            
+        Parameters
+        ----------
+        max_turn : bool
+            True for the max player, False for the min player
+        max_depth : int
+            how many moves the AI will look ahead
+        board : board.Board
+            the Board object that stores the matrix for the game
+        depth : int, optional
+            the starting depth (default is 0)
+
+        Returns
+        -------
+        int
+            the best score that the player can achieve
+        """
+
+        if depth == 0:
+            board.set_turn(max_turn)    #The search moves for the player to move
+
+        return self.run(self.context(minimax=True), max_turn, max_depth, board, \
+            float('-inf'), float('inf'), depth)
+
+    def make_best_move(self, board):
+        """ Makes the best move found by the AI.
+
+        Parameters
+        ----------
+        board : board.Board
+            the Board object that stores the matrix for the game
+        """
+
+        frm, to = decode_move(self.best_move)
+        piece, spot = board.squares[frm], COORDS[to]
+
+        #Print the move in the console
+        print('{} {} will move from {} to {}' \
+                .format("White" if piece.white else "Black", \
+                type(piece).__name__, \
+                piece.location, spot))
+
+        #Updates the piece location and the board
+        piece.update(spot[0], spot[1], board)
+
+    def search(self, max_turn, board, max_depth=None, time_budget=None, minimax=False):
+        """ Searches for the best move and measures the search.
+
+        Parameters
+        ----------
+        max_turn : bool
+            True for the max player, False for the min player
+        board : board.Board
+            the Board object that stores the matrix for the game
+        max_depth : int, optional
+            how many moves the AI will look ahead, or the deepest search
+            to try with a time budget (default is 3, or 64 with a budget)
+        time_budget : int, optional
+            milliseconds the search may use with iterative deepening,
+            replaces the fixed depth when given (default is None)
+        minimax : bool, optional
+            use minimax instead of alpha-beta pruning (default is False)
+
+        Returns
+        -------
+        search_stats.SearchStats
+            the result and statistics of the search, best_move is updated
+        """
+
+        algorithm = self.minimax if minimax else self.alpha_beta_pruning
+        stats = SearchStats('minimax' if minimax else 'alpha_beta')
+
+        nodes, cutoffs, first_cutoffs = self.nodes, self.cutoffs, self.first_cutoffs
+        researches = self.researches
+        if self.tt is not None:
+            tt_probes, tt_hits = self.tt.probes, self.tt.hits
+        self.q_nodes = 0
+
+        start = time.perf_counter()
+        if time_budget is None:
+            max_depth = max_depth or 3
+            stats.score = algorithm(max_turn, max_depth, board)
+            stats.depth = max_depth
+            stats.add_depth(max_depth, self.nodes - nodes, self.q_nodes, time.perf_counter() - start, \
+                self.pv)
+        else:
+            stats.score, stats.depth = self.iterative_deepening(max_turn, time_budget, board, \
+                max_depth or 64, algorithm)
+            for entry in self.depth_log:
+                stats.add_depth(*entry)
+        stats.elapsed = time.perf_counter() - start
+
+        stats.nodes = self.nodes - nodes
+        stats.q_nodes = sum(entry['q_nodes'] for entry in stats.depths)
+        stats.cutoffs = self.cutoffs - cutoffs
+        stats.first_cutoffs = self.first_cutoffs - first_cutoffs
+        stats.researches = self.researches - researches
+        if self.tt is not None and not minimax:
+            stats.tt_probes = self.tt.probes - tt_probes
+            stats.tt_hits = self.tt.hits - tt_hits
+        stats.set_move(self.best_move)
+        stats.set_pv(self.pv)
+
+        if self.stats_log is not None:
+            stats.write(self.stats_log)
+
+        return stats
+
+    def alpha_beta_pruning(self, max_turn, max_depth, board, alpha=float('-inf'), beta=float('inf'), depth=0):
+        """ Chooses the best move to make with the addition of alph-beta pruning.
+
+        The search is negamax.negamax with the transposition table,
+        move ordering, quiescence, principal variation search, null
+        move pruning and late move reductions that are turned on. From
+        the root, the moves of the last principal variation that are
+        still ahead are searched first.
+            
+        Parameters
+        ----------
+        max_turn : bool
+            True for the max player, False for the min player
+        max_depth : int
+            how many moves the AI will look ahead
+        board : board.Board
+            the Board object that stores the matrix for the game
+        alpha : int, optional
+            used to prune (default is -inf)
+        beta : int, optional
+            used to prune (default is inf)            
+        depth : int, optional
+            the starting depth (default is 0)
+
+        Returns
+        -------
+        int
+            the best score that the player can achieve
+        """
+
+        if depth == 0:
+            board.set_turn(max_turn)    #The key must match the player moving
+            if self.tt is not None:
+                self.tt.new_search()
+            if self.orderer is not None:
+                self.orderer.new_search()
+
+        follow = self.follow_line(board) if depth == 0 else ()
+        return self.run(self.context(follow=follow), max_turn, max_depth, board, alpha, beta, depth)
+
+    def context(self, minimax=False, follow=()):
+        """ Creates the context for one search with the settings and hooks of the AI.
+
+        Parameters
+        ----------
+        minimax : bool, optional
+            search every move without pruning, ordering, the table or
+            quiescence (default is False)
+        follow : list, optional
+            moves to search first from the root (default is ())
+
+        Returns
+        -------
+        negamax.SearchContext
+            a new context, so searches do not share their counts
+        """
+
+        if minimax:
+            return SearchContext(evaluate=self.evaluate, alpha_beta=False, pvs=False, \
+                deadline=self.deadline, stop=self.stop)
+
+        pruners = ([null_move_prune] if self.null_move else []) + self.pruners
+        return SearchContext(self.tt, self.evaluate, self.orderer, pruners, \
+            self.reduction if self.lmr else None, True, self.pvs, self.q_budget, \
+            self.deadline, self.stop, follow)
+
+    def follow_line(self, board):
+        """ Gets the part of the last principal variation that is still ahead.
+
+        The line is used from the start when the position is searched
+        again, such as by the next depth of iterative deepening. When the
+        first moves of the line were played since, such as the AI's move
+        and the expected reply, the rest of the line is used.
+
+        Parameters
+        ----------
+        board : board.Board
+            the Board object that stores the matrix for the game
+
+        Returns
+        -------
+        list
+            the packed moves left of the line, empty if the game left it
+        """
+
+        history = board.history
+        for played in range(min(len(self.pv), len(history)) + 1):
+            start = history[-played][4] if played else board.key
+            if start != self.pv_key:
+                continue
+
+            #The moves played since the search must be the start of the line
+            if all(frm << 6 | to == move for (frm, to, *_), move \
+                in zip(history[len(history) - played:], self.pv)):
+                return self.pv[played:]
+
+        return []
+
+    def run(self, ctx, max_turn, max_depth, board, alpha, beta, depth):
+        """ Runs a negamax search and keeps its result and counts.
+
+        Scores outside the search are from the view of the white player
+        (max), so the window and score are turned for the min player.
+
+        Parameters
+        ----------
+        ctx : negamax.SearchContext
+            the context of the search
+        max_turn : bool
+            True for the max player, False for the min player
+        max_depth : int
+            how many moves the AI will look ahead
+        board : board.Board
+            the Board object that stores the matrix for the game
+        alpha : int
+            used to prune
+        beta : int
+            used to prune
+        depth : int
+            the starting depth, the best move and principal variation
+            are only kept at depth 0
+
+        Returns
+        -------
+        int
+            the best score that the player can achieve
+        """
+
+        sign = 1 if max_turn else -1
+
+        try:
+            if max_turn:
+                score, pv = negamax(board, max_depth - depth, alpha, beta, depth, ctx)
+            else:
+                score, pv = negamax(board, max_depth - depth, -beta, -alpha, depth, ctx)
+        finally:
+            #Timed out searches still count their nodes
+            self.nodes += ctx.nodes
+            self.q_nodes = ctx.q_nodes
+            self.cutoffs += ctx.cutoffs
+            self.first_cutoffs += ctx.first_cutoffs
+            self.researches += ctx.researches
+
+        if depth == 0:
+            self.best_move = pv[0] if pv else None
+            self.pv, self.pv_key = pv, board.key
+
+        return sign * score
+
+    def aspiration_search(self, max_turn, max_depth, board, guess):
+        """ Searches the root with a narrow window around the score of the last depth.
+
+        The score rarely moves far from one depth to the next, so a
+        narrow window prunes more. When the score falls outside it, the
+        side that failed is widened four times and the root is searched
+        again, until the window is opened all the way.
+
+        Parameters
+        ----------
+        max_turn : bool
+            True for the max player, False for the min player
+        max_depth : int
+            how many moves the AI will look ahead
+        board : board.Board
+            the Board object that stores the matrix for the game
+        guess : int
+            the score of the last finished depth
+
+        Returns
+        -------
+        int
+            the best score that the player can achieve
+        """
+
+        low = high = ASPIRATION_WINDOW
+        while True:
+            alpha = guess - low if low <= ASPIRATION_LIMIT else float('-inf')
+            beta = guess + high if high <= ASPIRATION_LIMIT else float('inf')
+
+            score = self.alpha_beta_pruning(max_turn, max_depth, board, alpha, beta)
+
+            if score <= alpha and alpha != float('-inf'):
+                low *= 4    #Failed low, the real score is below the window
+            elif score >= beta and beta != float('inf'):
+                high *= 4   #Failed high, the real score is above the window
+            else:
+                return score
+
+            self.researches += 1
+
+    def iterative_deepening(self, max_turn, time_budget, board, max_depth=64, search=None):
+        """ Searches 1, 2, 3... moves ahead until the time budget runs out.
+
+        Each depth is a complete search, and the best move of the deepest
+        search that finished is kept. With pvs, the alpha-beta searches
+        after the first start with an aspiration window around the score
+        of the depth before. A search that runs out of time is
+        stopped, its moves are undone, and its result is thrown away.
+        Depth 1 always finishes, so there is always a move to make. The
+        transposition table keeps the results of the shallower searches,
+        so each new depth starts with what was already found.
+
+        Parameters
+        ----------
+        max_turn : bool
+            True for the max player, False for the min player
+        time_budget : int
+            milliseconds the search may use for the move
+        board : board.Board
+            the Board object that stores the matrix for the game
+        max_depth : int, optional
+            the deepest search to try (default is 64)
+        search : method, optional
+            the search to deepen, minimax or alpha_beta_pruning (default
+            is alpha_beta_pruning)
+
+        Returns
+        -------
+        tuple
+            the best score and the depth of the deepest finished search
+        """
+
+        if search is None:
+            search = self.alpha_beta_pruning
+
+        deadline = time.perf_counter() + time_budget / 1000
+        history_len = len(board.history)
+
+        best_move, best_score, finished = None, None, 0
+        best_pv, pv_key = self.pv, self.pv_key
+        self.depth_log = []
+
+        try:
+            for depth in range(1, max_depth + 1):
+                start, nodes = time.perf_counter(), self.nodes
+                if self.pvs and search == self.alpha_beta_pruning and best_score is not None \
+                    and abs(best_score) != float('inf'):
+                    score = self.aspiration_search(max_turn, depth, board, best_score)
+                else:
+                    score = search(max_turn, depth, board)
+
+                #The search finished, so its move replaces the last one
+                best_move, best_score, finished = self.best_move, score, depth
+                best_pv, pv_key = self.pv, self.pv_key
+                self.depth_log.append((depth, self.nodes - nodes, self.q_nodes, \
+                    time.perf_counter() - start, best_pv))
+
+                #Out of time, or a King capture decides the game at any depth
+                if time.perf_counter() > deadline or abs(score) == float('inf'):
+                    break
+
+                self.deadline = deadline    #Depths after the first can be stopped
+
+        except SearchTimeout:
+            #Undo the moves of the unfinished search
+            while len(board.history) > history_len:
+                board.unmake_move()
+
+        finally:
+            self.deadline = None
+
+        self.best_move = best_move
+        self.pv, self.pv_key = best_pv, pv_key   #Failed aspiration searches leave their own line
+        return best_score, finished
@@ -0,0 +1,274 @@
+""" Helpers for the 64-bit bitboard representation of the chessboard.
+
+Squares are numbered 0 to 63 with square = y * 8 + x, so square 0 is the
+top left space of the display (x=0, y=0) and square 63 is the bottom right
+space (x=7, y=7). Bit n of a bitboard is set when square n is occupied.
+
+Bitboards are indexed by the color of a piece with the `white` bool, so
+index False (0) is the black team and index True (1) is the white team.
+
+Moves are packed into small ints, from square << 6 | to square, which fit
+in an array('H') with the top 4 bits left for move flags.
+"""
+
+#Piece kind indices, in the order the pieces are added to the team lists
+KING = 0
+QUEEN = 1
+ROOK = 2
+KNIGHT = 3
+BISHOP = 4
+PAWN = 5
+
+FULL = (1 << 64) - 1    #Every square on the board
+
+BIT = [1 << sq for sq in range(64)]    #Single square bitboards
+COORDS = [(sq & 7, sq >> 3) for sq in range(64)]   #(x, y) of each square
+
+
+def square(x, y):
+    """ Converts board coordinates into a square index.
+
+    Parameters
+    ----------
+    x : int
+        x position on the board
+    y : int
+        y position on the board
+
+    Returns
+    -------
+    int
+        the square index (0 to 63)
+    """
+
+    return y * 8 + x
+
+def coords(sq):
+    """ Converts a square index into board coordinates.
+
+    Parameters
+    ----------
+    sq : int
+        the square index (0 to 63)
+
+    Returns
+    -------
+    tuple
+        the (x, y) location of the square
+    """
+
+    return sq & 7, sq >> 3
+
+def square_name(sq):
+    """ Gets the algebraic name of a square.
+
+    White starts at the bottom of the board, so y = 7 is rank 1
+    and y = 0 is rank 8.
+
+    Parameters
+    ----------
+    sq : int
+        the square index (0 to 63)
+
+    Returns
+    -------
+    str
+        the name of the square, like 'e2'
+    """
+
+    return 'abcdefgh'[sq & 7] + str(8 - (sq >> 3))
+
+def parse_square(name):
+    """ Converts an algebraic square name into a square index.
+
+    Parameters
+    ----------
+    name : str
+        the name of the square, like 'e2'
+
+    Returns
+    -------
+    int
+        the square index (0 to 63)
+
+    Raises
+    ------
+    ValueError
+        If the name is not a square on the board.
+    """
+
+    if len(name) != 2 or name[0] not in 'abcdefgh' or name[1] not in '12345678':
+        raise ValueError('{} is not a square'.format(name))
+
+    return (8 - int(name[1])) * 8 + 'abcdefgh'.index(name[0])
+
+def encode_move(frm, to):
+    """ Packs a move into a small int.
+
+    Parameters
+    ----------
+    frm : int
+        the square the piece moves from
+    to : int
+        the square the piece moves to
+
+    Returns
+    -------
+    int
+        the packed move
+    """
+
+    return frm << 6 | to
+
+def decode_move(move):
+    """ Unpacks a move made with encode_move.
+
+    Parameters
+    ----------
+    move : int
+        the packed move
+
+    Returns
+    -------
+    tuple
+        the from square and to square of the move
+    """
+
+    return move >> 6 & 63, move & 63
+
+def move_name(move):
+    """ Gets the coordinate notation of a packed move.
+
+    Parameters
+    ----------
+    move : int
+        the packed move
+
+    Returns
+    -------
+    str
+        the move, like 'e2e4'
+    """
+
+    return square_name(move >> 6 & 63) + square_name(move & 63)
+
+def parse_move(name):
+    """ Converts a move in coordinate notation into a packed move.
+
+    Parameters
+    ----------
+    name : str
+        the move, like 'e2e4'
+
+    Returns
+    -------
+    int
+        the packed move
+
+    Raises
+    ------
+    ValueError
+        If either square is not on the board.
+    """
+
+    return parse_square(name[:2]) << 6 | parse_square(name[2:4])
+
+def popcount(bb):
+    """ Counts the number of occupied squares in a bitboard.
+
+    Parameters
+    ----------
+    bb : int
+        the bitboard
+
+    Returns
+    -------
+    int
+        the number of set bits
+    """
+
+    return bin(bb).count('1')
+
+def lsb(bb):
+    """ Gets the lowest occupied square of a non-empty bitboard.
+
+    Parameters
+    ----------
+    bb : int
+        the bitboard
+
+    Returns
+    -------
+    int
+        the square index of the lowest set bit
+    """
+
+    return (bb & -bb).bit_length() - 1
+
+def squares_of(bb):
+    """ Lists the occupied squares of a bitboard.
+
+    Parameters
+    ----------
+    bb : int
+        the bitboard
+
+    Returns
+    -------
+    list
+        the square indices of every set bit, lowest first
+    """
+
+    found = []
+    while bb:
+        low = bb & -bb
+        found.append(low.bit_length() - 1)
+        bb ^= low   #Clear the lowest bit
+    return found
+
+
+class MatrixRow():
+    """ A single row of a MatrixView.
+
+    Methods
+    -------
+    __getitem__(x)
+        returns the piece on the space in this row
+    """
+
+    __slots__ = ('squares', 'offset')
+
+    def __init__(self, squares, offset):
+        self.squares = squares  #Shared mailbox list of the board
+        self.offset = offset    #Square index of the first space in the row
+
+    def __getitem__(self, x):
+        return self.squares[self.offset + x]
+
+    def __len__(self):
+        return 8
+
+
+class MatrixView():
+    """ Read only 8x8 matrix view of a 64 square mailbox.
+
+    Keeps the `board[y][x]` indexing that the pieces and the display use
+    without rebuilding a matrix after every move. The rows are created
+    once, so indexing does not allocate.
+
+    Methods
+    -------
+    __getitem__(y)
+        returns the row of the board
+    """
+
+    __slots__ = ('rows',)
+
+    def __init__(self, squares):
+        self.rows = [MatrixRow(squares, y * 8) for y in range(8)]
+
+    def __getitem__(self, y):
+        return self.rows[y]
+
+    def __len__(self):
+        return 8
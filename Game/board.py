@@ -1,420 +1,972 @@
-from king import King
-from queen import Queen
-from bishop import Bishop
-from knight import Knight
-from rook import Rook
-from pawn import Pawn
-import random
-
-class Board():
-    """ A class to represent a Board for a chessgame.
-    
-    Attributes
-    ----------
-    chessboard : pygame.Surface
-        the current pygame surface being used
-
-    Methods
-    -------
-    add_pieces()
-        appends the proper pieces and locations to each team list
-    clone_move(piece_newl)
-        returns the moving piece, piece being captured (if applicable), and copy object
-    get_idx_piece(piece)
-        returns the list the piece is in and the index
-    reset_lists(involved)
-        resets the lists and matricies to have the initial pieces
-    update_board()
-        updates the display and the matrix
-    display_pieces()
-        decides which piece images should be displayed on the screen
-    create_matrix()
-        makes the board matrix
-    turn_moves_b()
-        gets the possible moves for the black player
-    turn_moves_w()
-        gets the possible moves for the white player
-    pieces_left()
-        returns True if both players have pieces left
-    in_check(max_turn)
-        returns True and the possible moves if the King is in check
-    king_captured()
-        returns True if the King is captured
-    get_game_status()
-        returns True if one of the end conditions is True
-    evaluate_score()
-        returns the current score of the game
-    """
-
-    def __init__(self, chessboard):
-        self.wp = []    #White pieces
-        self.bp = []    #Black pieces
-        self.add_pieces()
-
-        self.board = [[None for i in range(8)] for j in range(8)]
-        self.create_matrix()
-        
-        self.chessboard = chessboard    #Surface
-
-        self.score = 0
-        self.game_over = False
-
-    def add_pieces(self):
-        """ Appends the proper pieces and locations to each team list.
-        
-        Team lists are used to get the possible moves and easily
-        check the capture status of a piece.
-        """
-
-        self.wp.append(King(4, 7, True))
-        self.wp.append(Queen(3, 7, True))
-        self.wp.append(Rook(0, 7, True))
-        self.wp.append(Rook(7, 7, True))
-        self.wp.append(Knight(1, 7, True))
-        self.wp.append(Knight(6, 7, True))
-        self.wp.append(Bishop(2, 7, True))
-        self.wp.append(Bishop(5, 7, True))
-        for i in range(8):
-            self.wp.append(Pawn(i, 6, True))
-
-        self.bp.append(King(4, 0, False))
-        self.bp.append(Queen(3, 0, False))
-        self.bp.append(Rook(0, 0, False))
-        self.bp.append(Rook(7, 0, False))
-        self.bp.append(Knight(1, 0, False))
-        self.bp.append(Knight(6, 0, False))
-        self.bp.append(Bishop(2, 0, False))
-        self.bp.append(Bishop(5, 0, False))
-        for i in range(8):
-            self.bp.append(Pawn(i, 1, False))
-
-    def clone_move(self, piece_newl):
-        """ Clones pieces and temporarily moves the piece in the matrix and list.
-        
-        Clones the pieces that will be involved with the move,
-        moves the clone piece, and updates the matrix for future moves.
-        Original piece objects and locations will be returned in a list.
-        The copied piece object is also returned.
-
-        Parameters
-        ----------
-        piece_newl : list
-            list of original piece object and the new location
-
-        Returns
-        -------
-        tuple
-            list of the pieces involved and the copy of the piece
-        """
-
-        org_p, new_location = piece_newl    #piece and space to move
-        x, y = new_location
-
-        copy_p = org_p.clone()    #copy of the original piece
-
-        #stores the index of the piece in the corresponding piece list
-        in_list, org_idx = self.get_idx_piece(org_p)
-
-        #change the piece in the list
-        in_list[org_idx] = copy_p
-
-        #If the new space has a piece it needs to be copied
-        if self.board[y][x] is not None:
-            occ_p = self.board[y][x]
-            
-            copy_occ_p = occ_p.clone()
-
-            #gets the index of the piece in the corresponding piece list
-            in_list, occ_idx = self.get_idx_piece(occ_p)
-
-            #change the occupied piece in the list
-            in_list[occ_idx] = copy_occ_p
-
-        self.create_matrix()   #update the matrix
-
-        copy_p.update_clone(x, y, self)   #move the piece
-
-        #copy_p.update_clone(x, y, self)   #move the piece
-        
-        self.create_matrix()    #update the matrix
-
-        #Depends if two pieces were involved or not
-        try:
-            return [org_p, org_idx, occ_p, occ_idx], copy_p
-        except UnboundLocalError:
-            return [org_p, org_idx], copy_p
-
-    def get_idx_piece(self, piece):
-        """ Gets the team that the piece is on and the index where the piece is.
-
-        Parameters
-        ----------
-        piece : obj (depends on the child class)
-            list of original piece object and the new location
-
-        Returns
-        -------
-        tuple
-            the list for the team and index in that list
-        """
-
-        #choose which list to alter
-        in_list = self.wp if piece.white else self.bp
-
-        #get index in list of original piece
-        for idx in range(len(in_list)):
-            if in_list[idx] is piece:
-                return in_list, idx       #index in pieces list
-
-    def reset_lists(self, involved):
-        """ Resets the game state before attempting to find the best move.
-
-        Used to ensure that the board has no lingering copies or any 
-        unwanted images being displayed.
-
-        Parameters
-        ----------
-        involved : list
-            a list of the piece and the new location
-        """
-
-        indices = involved[0]
-        cx, cy = involved[1].location
-
-        involved[1].captured = True #ensure that the piece is gone
-        
-        self.board[cy][cx] = None
-        #Piece and index next to each other
-        for i in range(0, len(indices), 2):
-            #Which list was the piece in
-            in_list = self.wp if indices[i].white else self.bp
-            in_list[indices[i+1]] = indices[i]  #Replace the copied piece
-        
-        self.create_matrix()    #Update the matrix
-
-    def display_pieces(self):
-        """ Display the non-captured pieces on the pygame surface. """
-
-        for i in range(len(self.wp)):
-            if not self.wp[i].captured:
-                self.wp[i].show_image(self.chessboard)
-        
-        for i in range(len(self.bp)):
-            if not self.bp[i].captured:
-                self.bp[i].show_image(self.chessboard)
-
-    def create_matrix(self):
-        """ Creates a matrix that has the non-captured pieces. """
-
-        #Placing the white team
-        for i in range(len(self.wp)):
-            if not self.wp[i].captured:
-                x, y = self.wp[i].location
-                self.board[y][x] = self.wp[i]
-
-        #Placing the black team
-        for i in range(len(self.bp)):
-            if not self.bp[i].captured:
-                x, y = self.bp[i].location
-                self.board[y][x] = self.bp[i] 
-
-    def update_board(self):
-        """ Runs the method to display pieces and create a matrix. """
-
-        self.display_pieces()
-        self.create_matrix()
-
-    def turn_moves_b(self):
-        """ Gets the possible moves for the black player.
-
-        Returns
-        -------
-        list
-            list that contains piece object with possible locations
-
-        Raises
-        ------
-        TypeError
-            If there are not any moves, the move list is empty.
-        """
-
-        game_boards = []
-
-        #For each of the pieces in black pieces
-        for i in self.bp[1:]:
-            #If the piece is still playable
-            if not i.captured:
-                piece_states = i.turn_moves(self.board)
-                for j in piece_states:
-                    game_boards.append([i, j])  #{Old location, new location}
-        
-        #Shuffle the list so the same move is not chosen on ties
-        try:
-            random.shuffle(game_boards)
-        except TypeError:
-            pass
-        
-        return game_boards
-
-    def turn_moves_w(self):
-        """ Gets the possible moves for the white player.
-
-        Returns
-        -------
-        list
-            list that contains piece object with possible locations
-
-        Raises
-        ------
-        TypeError
-            If there are not any moves, the move list is empty.
-        """
-
-        game_boards = []
-
-        #For each of the pieces in white pieces
-        for i in self.wp:
-            #If the piece is still playable
-            if not i.captured:
-                piece_states = i.turn_moves(self.board)
-                for j in piece_states:
-                    game_boards.append([i, j])  #{Old location, new location}
-        
-        #Shuffle the list so the same move is not chosen on ties
-        try:
-            random.shuffle(game_boards)
-        except TypeError:
-            pass
-        
-        return game_boards
-        
-    def pieces_left(self):
-        """ Checks to see if both teams still have at least one piece left.
-        
-        Returns
-        -------
-        bool
-            True if both teams have a piece left, False if one/both teams
-            have no pieces remaining
-        """
-
-        w_moves = False
-        b_moves = False
-
-        #Both look for at least one playable piece
-        for w in self.wp:
-            if not w.captured:
-                w_moves = True
-                break
-        
-        for b in self.bp:
-            if not b.captured:
-                b_moves = True
-                break
-        
-        #Returns True if both players have a piece left
-        return w_moves and b_moves 
-
-    def in_check(self, max_turn):
-        """ Checks to see if the current player King is in check.
-        
-        Parameters
-        ----------
-        max_turn : bool
-            True for max player, False for min player
-
-        Returns
-        -------
-        tuple
-            (True, possible moves) if the King is in check
-            (False, None) if the King is not in check
-        """
-
-        white = self.turn_moves_w()
-        black = self.turn_moves_b()
-
-        #White turn check if black can capture next move
-        if max_turn:
-            king_space = self.wp[0].location    #Store King spots
-
-            for b in black:
-                if b[1] == king_space:
-
-                    #----- Valid spots to move -----
-                    #Valid spots to move
-                    get_out = self.wp[0].turn_moves(self.board)
-                    for b in black:
-                        if b[1] in get_out:
-                            get_out.remove(b[1])
-                    #-------------------------------
-                    return True, get_out    #True if a spot matches
-
-        #Black turn check if white can capture next move
-        else:
-            king_space = self.bp[0].location
-
-            #Cross-checking same spots
-            for w in white:
-                if w[1] == king_space:
-                    #----- Valid spots to move -----
-                    #Valid spots to move
-                    get_out = self.bp[0].turn_moves(self.board)
-                    for w in white:
-                        if w[1] in get_out:
-                            get_out.remove(w[1])
-                    #-------------------------------
-                    return True, get_out     #True if a spot matches
-        
-        return False, None    #The King is not in check
-
-    def king_captured(self):
-        """ Checks if either King has been captured.
-        
-        Returns
-        -------
-        bool
-            True if a King has been captured, otherwise False
-        """
-
-        if self.wp[0].captured or self.bp[0].captured:
-            return True
-
-        return False
-
-    def get_game_status(self):
-        """ Checks both end game conditions.
-        
-        Returns
-        -------
-        bool
-            True if a either condition met, False if both
-            are not met
-        """
-
-        if not self.pieces_left() or self.king_captured():
-            self.game_over = True
-        
-        return self.game_over
-
-    def evaluate_score(self):
-        """ Calculates the score of the current board.
-        
-        Returns
-        -------
-        int
-            the calculated score of the board
-        """
-        
-        score = 0
-
-        #Add the scores of the white player (MAX)
-        for w in self.wp:
-            if not w.captured:
-                score += w.value
-
-        #Subtract the scores of the black player (MIN)
-        for b in self.bp:
-            if not b.captured:
-                score -= b.value
-
-        return score
+from king import King
+from queen import Queen
+from bishop import Bishop
+from knight import Knight
+from rook import Rook
+from pawn import Pawn
+from bitboard import BIT, COORDS, FULL, KING, QUEEN, ROOK, KNIGHT, BISHOP, PAWN, MatrixView, \
+    lsb, squares_of, parse_square, square_name
+from attacks import KNIGHT_ATTACKS, KING_ATTACKS, PAWN_ATTACKS, BETWEEN, rook_attacks, bishop_attacks
+from zobrist import PIECE_KEYS, FIRST_MOVE_KEYS, BLACK_TO_MOVE, board_key
+from evaluation import PIECE_SCORES, board_score
+from errors import InvalidFEN
+from array import array
+import random
+
+FIRST_MOVE = 1      #Undo flag, the move was the first move of a Pawn
+NULL_MOVE = 2       #Undo flag, the player passed without moving
+
+#Class of each kind of piece, indexed by the bitboard kind
+PIECE_TYPES = [King, Queen, Rook, Knight, Bishop, Pawn]
+
+#FEN letter of each kind of piece, upper case for white
+FEN_PIECES = 'kqrnbp'
+
+#The game has no castling, so the start position has no castling rights
+START_FEN = 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w - - 0 1'
+
+class Board():
+    """ A class to represent a Board for a chessgame.
+    
+    Attributes
+    ----------
+    bitboards : list
+        one bitboard per piece kind for each team, indexed [white][kind]
+    occupancy : list
+        bitboard of all the spaces used by each team, indexed [white]
+    occupied : int
+        bitboard of all the spaces used by both teams
+    squares : list
+        the piece on each of the 64 squares (None if empty)
+    board : bitboard.MatrixView
+        8x8 matrix view of the squares, indexed [y][x]
+    history : list
+        undo stack of (from square, to square, captured piece, flags, key, score)
+    white_turn : bool
+        True when it is the white player's turn to move
+    key : int
+        Zobrist key of the position, updated as moves are made
+    score : int
+        material and piece-square score of the position, updated as
+        moves are made
+    attack_maps : list
+        bitboard of the spaces each team attacks, indexed [white], None
+        until it is needed for the current position
+    castling : str
+        FEN castling rights of the position, kept for when castling is
+        added to the game ('-' for none)
+    en_passant : int
+        FEN en passant square of the position, kept for when en passant
+        is added to the game (None for none)
+    halfmove : int
+        FEN halfmove clock of the position when it was set
+    fullmove : int
+        FEN move number of the position when it was set
+
+    Methods
+    -------
+    add_pieces()
+        appends the proper pieces and locations to each team list
+    set_pieces(wp, bp, white_turn=True)
+        replaces the pieces and rebuilds the position
+    snapshot()
+        returns the position packed into bytes
+    from_snapshot(snapshot)
+        returns a new board with the position of a snapshot
+    from_fen(fen)
+        returns a new board with the position of a FEN string
+    to_fen()
+        returns the FEN string of the position
+    make_move(move)
+        moves a piece in place and pushes the undo information
+    unmake_move()
+        takes back the last move made with make_move
+    make_null_move()
+        passes the turn to the other player
+    set_turn(white)
+        sets which player is moving next
+    place_piece(piece)
+        adds a piece to the bitboards and squares
+    remove_piece(piece)
+        removes a piece from the bitboards and squares
+    create_matrix()
+        rebuilds the bitboards and squares from the team lists
+    turn_moves_b(shuffle=True)
+        gets the possible moves for the black player
+    turn_moves_w(shuffle=True)
+        gets the possible moves for the white player
+    pieces_left()
+        returns True if both players have pieces left
+    attackers(sq, by_white, occupied=None)
+        returns the bitboard of the pieces of a team that attack a square
+    square_attacked(sq, by_white, occupied=None)
+        returns True if a team attacks a square
+    attack_map(white)
+        returns the bitboard of the spaces a team attacks
+    in_check(max_turn)
+        returns True and the possible moves if the King is in check
+    legal_moves(white, shuffle=True)
+        gets the moves that do not leave the King in check
+    search_moves(white, shuffle=True)
+        gets the moves the AIs search for a player
+    capture_moves(white)
+        gets the moves that capture a piece for a player
+    king_captured()
+        returns True if the King is captured
+    get_game_status()
+        returns True if one of the end conditions is True
+    evaluate_score()
+        returns the current score of the game
+    """
+
+    def __init__(self):
+        self.wp = []    #White pieces
+        self.bp = []    #Black pieces
+        self.add_pieces()
+
+        self.bitboards = [[0] * 6, [0] * 6]     #[black, white] piece kinds
+        self.occupancy = [0, 0]     #[black, white] spaces used
+        self.occupied = 0           #Spaces used by either team
+
+        self.squares = [None] * 64  #Piece on each square (mailbox)
+        self.board = MatrixView(self.squares)   #board[y][x] access to squares
+        self.create_matrix()
+
+        self.history = []   #Undo stack for make_move/unmake_move
+
+        self.white_turn = True      #White moves first unless set_turn is used
+        self.key = board_key(self)  #Zobrist key of the position
+        self.score = board_score(self)  #Material and square score, + for white
+        self.attack_maps = [None, None]     #Built when needed for a position
+        self.game_over = False
+
+        #FEN fields the game does not play by yet
+        self.castling = '-'
+        self.en_passant = None
+        self.halfmove = 0
+        self.fullmove = 1
+
+    def add_pieces(self):
+        """ Appends the proper pieces and locations to each team list.
+        
+        Team lists are used to get the possible moves and easily
+        check the capture status of a piece.
+        """
+
+        self.wp.append(King(4, 7, True))
+        self.wp.append(Queen(3, 7, True))
+        self.wp.append(Rook(0, 7, True))
+        self.wp.append(Rook(7, 7, True))
+        self.wp.append(Knight(1, 7, True))
+        self.wp.append(Knight(6, 7, True))
+        self.wp.append(Bishop(2, 7, True))
+        self.wp.append(Bishop(5, 7, True))
+        for i in range(8):
+            self.wp.append(Pawn(i, 6, True))
+
+        self.bp.append(King(4, 0, False))
+        self.bp.append(Queen(3, 0, False))
+        self.bp.append(Rook(0, 0, False))
+        self.bp.append(Rook(7, 0, False))
+        self.bp.append(Knight(1, 0, False))
+        self.bp.append(Knight(6, 0, False))
+        self.bp.append(Bishop(2, 0, False))
+        self.bp.append(Bishop(5, 0, False))
+        for i in range(8):
+            self.bp.append(Pawn(i, 1, False))
+
+    def set_pieces(self, wp, bp, white_turn=True):
+        """ Replaces the pieces and rebuilds the position from them.
+
+        The history is cleared, so the moves before cannot be taken back.
+
+        Parameters
+        ----------
+        wp : list
+            the white pieces, with the King first
+        bp : list
+            the black pieces, with the King first
+        white_turn : bool, optional
+            True if the white player moves next (default is True)
+        """
+
+        self.wp = wp
+        self.bp = bp
+        self.create_matrix()
+
+        self.history = []
+        self.white_turn = white_turn
+        self.key = board_key(self)
+        self.score = board_score(self)
+        self.attack_maps = [None, None]
+        self.game_over = False
+
+        self.castling = '-'
+        self.en_passant = None
+        self.halfmove = 0
+        self.fullmove = 1
+
+    def snapshot(self):
+        """ Packs the position into bytes that are cheap to send to other processes.
+
+        Each of the first 64 bytes is 0 for an empty square, otherwise
+        the piece kind + 1, with bit 3 set for white and bit 4 set for a
+        Pawn that has not moved. The last byte is 1 if white moves next.
+
+        Returns
+        -------
+        bytes
+            the packed position
+        """
+
+        packed = bytearray(65)
+
+        for sq, piece in enumerate(self.squares):
+            if piece is not None:
+                packed[sq] = piece.kind + 1 | piece.white << 3 | \
+                    getattr(piece, 'first_move', False) << 4
+
+        packed[64] = self.white_turn
+        return bytes(packed)
+
+    @classmethod
+    def from_snapshot(cls, snapshot):
+        """ Creates a board with the position of a snapshot.
+
+        Parameters
+        ----------
+        snapshot : bytes
+            a position packed by Board.snapshot
+
+        Returns
+        -------
+        board.Board
+            a new board with the position
+        """
+
+        wp, bp = [], []
+
+        for sq in range(64):
+            code = snapshot[sq]
+            if code:
+                white = bool(code & 8)
+                piece = PIECE_TYPES[(code & 7) - 1](sq & 7, sq >> 3, white)
+                if piece.kind == PAWN:
+                    piece.first_move = bool(code & 16)
+                (wp if white else bp).append(piece)
+
+        #The King is kept first in the team lists
+        wp.sort(key=lambda piece: piece.kind)
+        bp.sort(key=lambda piece: piece.kind)
+
+        board = cls()
+        board.set_pieces(wp, bp, bool(snapshot[64]))
+        return board
+
+    @classmethod
+    def from_fen(cls, fen):
+        """ Creates a board with the position of a FEN string.
+
+        A Pawn on the rank it started on has not moved, so it keeps
+        its two space first move. The game has no promotion, so Pawns
+        may be on the first and last ranks, as to_fen writes them once
+        they get there. The castling and en passant fields
+        are checked and kept, but the game does not use them yet. The
+        move counters may be left off.
+
+        Parameters
+        ----------
+        fen : str
+            the position, like 'rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq e3 0 1'
+
+        Returns
+        -------
+        board.Board
+            a new board with the position
+
+        Raises
+        ------
+        InvalidFEN
+            If the string is not a position with one King for each team.
+        """
+
+        fields = fen.split()
+        if not 4 <= len(fields) <= 6:
+            raise InvalidFEN('{} does not have 4 to 6 fields'.format(fen))
+        placement, side, castling, en_passant = fields[:4]
+
+        #----- Pieces, from rank 8 (y = 0) down to rank 1 -----
+        rows = placement.split('/')
+        if len(rows) != 8:
+            raise InvalidFEN('{} does not have 8 ranks'.format(placement))
+
+        wp, bp = [], []
+        for y, row in enumerate(rows):
+            x = 0
+            for char in row:
+                if char in '12345678':
+                    x += int(char)
+                    continue
+
+                kind = FEN_PIECES.find(char.lower())
+                if kind < 0 or x > 7:
+                    raise InvalidFEN('rank {} is not valid: {}'.format(8 - y, row))
+
+                white = char.isupper()
+                piece = PIECE_TYPES[kind](x, y, white)
+                if kind == PAWN:
+                    piece.first_move = y == (6 if white else 1)
+                (wp if white else bp).append(piece)
+                x += 1
+
+            if x != 8:
+                raise InvalidFEN('rank {} does not have 8 spaces: {}'.format(8 - y, row))
+
+        #The King is kept first in the team lists
+        wp.sort(key=lambda piece: piece.kind)
+        bp.sort(key=lambda piece: piece.kind)
+        for team in (wp, bp):
+            if [piece.kind for piece in team].count(KING) != 1:
+                raise InvalidFEN('each team needs exactly one King: {}'.format(placement))
+        #-------------------------------------------------------
+
+        if side not in ('w', 'b'):
+            raise InvalidFEN('{} is not a side to move'.format(side))
+
+        if castling != '-' and (not set(castling) <= set('KQkq') \
+            or len(set(castling)) != len(castling)):
+            raise InvalidFEN('{} is not a castling field'.format(castling))
+
+        if en_passant != '-':
+            try:
+                if en_passant[1:] not in ('3', '6'):
+                    raise ValueError
+                en_passant = parse_square(en_passant)
+            except ValueError:
+                raise InvalidFEN('{} is not an en passant square'.format(en_passant)) from None
+
+        try:
+            halfmove = int(fields[4]) if len(fields) > 4 else 0
+            fullmove = int(fields[5]) if len(fields) > 5 else 1
+        except ValueError:
+            raise InvalidFEN('{} has move counters that are not numbers'.format(fen)) from None
+
+        board = cls()
+        board.set_pieces(wp, bp, side == 'w')
+        board.castling = castling
+        board.en_passant = None if en_passant == '-' else en_passant
+        board.halfmove = halfmove
+        board.fullmove = fullmove
+        return board
+
+    def to_fen(self):
+        """ Gets the FEN string of the position.
+
+        The castling field is written as it was loaded, and the en
+        passant square only until a move is made. The move number counts
+        the moves made since the position was set, but the halfmove clock
+        is written as it was loaded, since the game has no fifty move rule.
+
+        Returns
+        -------
+        str
+            the position, like 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w - - 0 1'
+        """
+
+        rows = []
+        for y in range(8):
+            row, empty = '', 0
+            for piece in self.squares[y * 8:y * 8 + 8]:
+                if piece is None:
+                    empty += 1
+                    continue
+
+                if empty:
+                    row += str(empty)
+                    empty = 0
+                letter = FEN_PIECES[piece.kind]
+                row += letter.upper() if piece.white else letter
+
+            if empty:
+                row += str(empty)
+            rows.append(row)
+
+        #The move number goes up after each black move
+        plies = len(self.history)
+        first_white = self.white_turn != bool(plies & 1)
+        fullmove = self.fullmove + (plies + (not first_white)) // 2
+
+        en_passant = '-'
+        if self.en_passant is not None and not plies:
+            en_passant = square_name(self.en_passant)
+
+        return '{} {} {} {} {} {}'.format('/'.join(rows), 'w' if self.white_turn else 'b', \
+            self.castling, en_passant, self.halfmove, fullmove)
+
+    def make_move(self, move):
+        """ Makes a move in place and pushes the undo information.
+
+        The moving piece is relocated and any piece on the new space
+        is marked as captured. Only the two squares involved in the
+        move change, and no pieces are copied. The from square, to
+        square, captured piece, flags, previous key and previous score
+        are pushed on the history stack so unmake_move can restore the
+        board exactly. The Zobrist key and the score are updated with
+        only the pieces that changed.
+
+        Parameters
+        ----------
+        move : int
+            the move packed by bitboard.encode_move
+
+        Returns
+        -------
+        obj (depends on the child class)
+            the captured piece, None if the space was empty
+        """
+
+        frm = move >> 6 & 63
+        to = move & 63
+        piece = self.squares[frm]
+        white = piece.white
+        kind = piece.kind
+        flags = 0
+
+        keys = PIECE_KEYS[white][kind]
+        key = self.key ^ keys[frm] ^ keys[to] ^ BLACK_TO_MOVE
+
+        scores = PIECE_SCORES[white][kind]
+        score = self.score - scores[frm] + scores[to]
+
+        #The desired spot has a piece there
+        captured = self.squares[to]
+        if captured is not None:
+            captured.captured = True   #set capture status to True
+            self.bitboards[not white][captured.kind] ^= BIT[to]
+            self.occupancy[not white] ^= BIT[to]
+            self.occupied ^= BIT[to]
+
+            key ^= PIECE_KEYS[not white][captured.kind][to]
+            score -= PIECE_SCORES[not white][captured.kind][to]
+            if captured.kind == PAWN and captured.first_move:
+                key ^= FIRST_MOVE_KEYS[to]
+
+        #Pawns lose the two space move once they have moved
+        if kind == PAWN and piece.first_move:
+            piece.first_move = False
+            flags |= FIRST_MOVE
+            key ^= FIRST_MOVE_KEYS[frm]
+
+        #Flip the old and new spaces on the bitboards
+        change = BIT[frm] | BIT[to]
+        self.bitboards[white][kind] ^= change
+        self.occupancy[white] ^= change
+        self.occupied ^= change
+
+        self.squares[frm] = None
+        self.squares[to] = piece
+        piece.location = COORDS[to]
+
+        self.history.append((frm, to, captured, flags, self.key, self.score))
+        self.key = key
+        self.score = score
+        self.attack_maps = [None, None]     #The attacks changed with the move
+        self.white_turn = not white     #The other player moves next
+
+        return captured
+
+    def unmake_move(self):
+        """ Takes back the last move made with make_move or make_null_move. """
+
+        frm, to, captured, flags, self.key, self.score = self.history.pop()
+        if flags & NULL_MOVE:
+            self.white_turn = not self.white_turn
+            return
+
+        self.attack_maps = [None, None]
+        piece = self.squares[to]
+        white = piece.white
+        self.white_turn = white
+
+        #Flip the new and old spaces back on the bitboards
+        change = BIT[frm] | BIT[to]
+        self.bitboards[white][piece.kind] ^= change
+        self.occupancy[white] ^= change
+        self.occupied ^= change
+
+        self.squares[to] = captured
+        self.squares[frm] = piece
+        piece.location = COORDS[frm]
+
+        if flags & FIRST_MOVE:
+            piece.first_move = True
+
+        #Put the captured piece back on the board
+        if captured is not None:
+            captured.captured = False
+            self.bitboards[not white][captured.kind] ^= BIT[to]
+            self.occupancy[not white] ^= BIT[to]
+            self.occupied ^= BIT[to]
+
+    def make_null_move(self):
+        """ Passes the turn to the other player without moving a piece.
+
+        Used by the null move pruning of the search, which is not a
+        move of the game. The pass is pushed on the history stack, so
+        unmake_move takes it back like any other move.
+        """
+
+        self.history.append((0, 0, None, NULL_MOVE, self.key, self.score))
+        self.key ^= BLACK_TO_MOVE
+        self.white_turn = not self.white_turn
+
+    def set_turn(self, white):
+        """ Sets which player is moving next and updates the key.
+
+        Parameters
+        ----------
+        white : bool
+            True for the white player, False for the black player
+        """
+
+        if white != self.white_turn:
+            self.white_turn = white
+            self.key ^= BLACK_TO_MOVE
+
+    def place_piece(self, piece):
+        """ Adds a piece to the bitboards and squares at its location.
+
+        Parameters
+        ----------
+        piece : obj (depends on the child class)
+            the piece being placed
+        """
+
+        x, y = piece.location
+        sq = y * 8 + x
+        bit = BIT[sq]
+
+        self.bitboards[piece.white][piece.kind] |= bit
+        self.occupancy[piece.white] |= bit
+        self.occupied |= bit
+        self.squares[sq] = piece
+
+    def remove_piece(self, piece):
+        """ Removes a piece from the bitboards and squares at its location.
+
+        Parameters
+        ----------
+        piece : obj (depends on the child class)
+            the piece being removed
+        """
+
+        x, y = piece.location
+        sq = y * 8 + x
+        mask = ~BIT[sq]
+
+        self.bitboards[piece.white][piece.kind] &= mask
+        self.occupancy[piece.white] &= mask
+        self.occupied &= mask
+        self.squares[sq] = None
+
+    def create_matrix(self):
+        """ Rebuilds the bitboards and squares from the non-captured pieces.
+
+        Moves update the bitboards incrementally, so this full rebuild is
+        only needed when the team lists are set up.
+        """
+
+        self.bitboards = [[0] * 6, [0] * 6]
+        self.occupancy = [0, 0]
+        self.occupied = 0
+        for sq in range(64):
+            self.squares[sq] = None
+
+        #Placing the white team
+        for i in range(len(self.wp)):
+            if not self.wp[i].captured:
+                self.place_piece(self.wp[i])
+
+        #Placing the black team
+        for i in range(len(self.bp)):
+            if not self.bp[i].captured:
+                self.place_piece(self.bp[i])
+
+    def turn_moves_b(self, shuffle=True):
+        """ Gets the possible moves for the black player.
+
+        Parameters
+        ----------
+        shuffle : bool, optional
+            shuffle the moves so ties are broken randomly, turned off when
+            the moves are sorted afterwards (default is True)
+
+        Returns
+        -------
+        array.array
+            the moves packed by bitboard.encode_move
+        """
+
+        game_boards = array('H')
+
+        #For each of the pieces in black pieces
+        for i in self.bp:
+            #If the piece is still playable
+            if not i.captured:
+                x, y = i.location
+                frm = (y * 8 + x) << 6
+                for to in squares_of(i.move_targets(self)):
+                    game_boards.append(frm | to)    #{Old square, new square}
+        
+        #Shuffle the list so the same move is not chosen on ties
+        if shuffle:
+            random.shuffle(game_boards)
+        
+        return game_boards
+
+    def turn_moves_w(self, shuffle=True):
+        """ Gets the possible moves for the white player.
+
+        Parameters
+        ----------
+        shuffle : bool, optional
+            shuffle the moves so ties are broken randomly, turned off when
+            the moves are sorted afterwards (default is True)
+
+        Returns
+        -------
+        array.array
+            the moves packed by bitboard.encode_move
+        """
+
+        game_boards = array('H')
+
+        #For each of the pieces in white pieces
+        for i in self.wp:
+            #If the piece is still playable
+            if not i.captured:
+                x, y = i.location
+                frm = (y * 8 + x) << 6
+                for to in squares_of(i.move_targets(self)):
+                    game_boards.append(frm | to)    #{Old square, new square}
+        
+        #Shuffle the list so the same move is not chosen on ties
+        if shuffle:
+            random.shuffle(game_boards)
+        
+        return game_boards
+        
+    def pieces_left(self):
+        """ Checks to see if both teams still have at least one piece left.
+        
+        Returns
+        -------
+        bool
+            True if both teams have a piece left, False if one/both teams
+            have no pieces remaining
+        """
+
+        #Returns True if both players have a piece left
+        return self.occupancy[True] != 0 and self.occupancy[False] != 0
+
+    def attackers(self, sq, by_white, occupied=None):
+        """ Gets the pieces of a team that attack a square.
+
+        Instead of generating the moves of the team, the attacks are
+        traced outward from the square: a Knight on a Knight jump away,
+        a King one space away, a Pawn on a diagonal behind the square,
+        and a Rook, Bishop or Queen at the end of a ray.
+
+        Parameters
+        ----------
+        sq : int
+            the square that may be attacked
+        by_white : bool
+            True if the white team is attacking, False for black
+        occupied : int, optional
+            the spaces that block the rays (default is every used space)
+
+        Returns
+        -------
+        int
+            bitboard of the attacking pieces
+        """
+
+        if occupied is None:
+            occupied = self.occupied
+        pieces = self.bitboards[by_white]
+
+        #Single step pieces are a table lookup
+        found = KNIGHT_ATTACKS[sq] & pieces[KNIGHT] | KING_ATTACKS[sq] & pieces[KING] \
+            | PAWN_ATTACKS[not by_white][sq] & pieces[PAWN]
+
+        #Sliding pieces are seen from the square along the same rays
+        found |= rook_attacks(sq, occupied) & (pieces[ROOK] | pieces[QUEEN])
+        found |= bishop_attacks(sq, occupied) & (pieces[BISHOP] | pieces[QUEEN])
+
+        return found
+
+    def square_attacked(self, sq, by_white, occupied=None):
+        """ Checks to see if a team attacks a square.
+
+        Parameters
+        ----------
+        sq : int
+            the square that may be attacked
+        by_white : bool
+            True if the white team is attacking, False for black
+        occupied : int, optional
+            the spaces that block the rays (default is every used space)
+
+        Returns
+        -------
+        bool
+            True if a piece of the team attacks the square
+        """
+
+        return self.attackers(sq, by_white, occupied) != 0
+
+    def attack_map(self, white):
+        """ Gets the bitboard of the spaces a team attacks.
+
+        The map is built once for a position and kept until the next
+        move is made or taken back.
+
+        Parameters
+        ----------
+        white : bool
+            True for the white team, False for the black team
+
+        Returns
+        -------
+        int
+            bitboard of the attacked spaces
+        """
+
+        attacked = self.attack_maps[white]
+
+        if attacked is None:
+            attacked = 0
+            for piece in (self.wp if white else self.bp):
+                if not piece.captured:
+                    attacked |= piece.attacks(self)
+            self.attack_maps[white] = attacked
+
+        return attacked
+
+    def in_check(self, max_turn):
+        """ Checks to see if the current player King is in check.
+
+        Only the King square is traced for attackers. The spaces the
+        King can escape to are traced with the King taken off the
+        board, so it cannot step back along the ray of a sliding piece.
+        
+        Parameters
+        ----------
+        max_turn : bool
+            True for max player, False for min player
+
+        Returns
+        -------
+        tuple
+            (True, possible King moves) if the King is in check
+            (False, None) if the King is not in check
+        """
+
+        king_bb = self.bitboards[max_turn][KING]
+
+        #A captured King cannot be in check
+        if not king_bb or not self.square_attacked(lsb(king_bb), not max_turn):
+            return False, None    #The King is not in check
+
+        #----- Valid spots to move -----
+        targets = KING_ATTACKS[lsb(king_bb)] & ~self.occupancy[max_turn]
+        without_king = self.occupied ^ king_bb
+        get_out = [COORDS[sq] for sq in squares_of(targets) \
+            if not self.square_attacked(sq, not max_turn, without_king)]
+        #-------------------------------
+
+        return True, get_out
+
+    def legal_moves(self, white, shuffle=True):
+        """ Gets the moves of a player that do not leave the King in check.
+
+        The King never moves to an attacked space. When the King is in
+        check by one piece, the other pieces can only capture the piece
+        or block its ray, and in double check only the King can move.
+        A piece pinned to the King by a Rook, Bishop or Queen can only
+        move along the pin.
+
+        Parameters
+        ----------
+        white : bool
+            True for the white player, False for the black player
+        shuffle : bool, optional
+            shuffle the moves so ties are broken randomly, turned off when
+            the moves are sorted afterwards (default is True)
+
+        Returns
+        -------
+        array.array
+            the moves packed by bitboard.encode_move, empty if the player
+            is checkmated or stalemated
+        """
+
+        game_boards = array('H')
+
+        king_bb = self.bitboards[white][KING]
+        if not king_bb:
+            return game_boards  #The game is over
+
+        king_sq = lsb(king_bb)
+        enemy = self.bitboards[not white]
+        own = self.occupancy[white]
+        checkers = self.attackers(king_sq, not white)
+
+        #----- Spaces the other pieces may move to -----
+        if not checkers:
+            allowed = FULL
+        elif checkers & (checkers - 1):
+            allowed = 0     #Double check, only the King can move
+        else:
+            #Capture the checking piece or block its ray
+            allowed = checkers | BETWEEN[king_sq][lsb(checkers)]
+
+        #----- Pinned pieces -----
+        #Sliding pieces that would attack the King through the same team
+        snipers = rook_attacks(king_sq, self.occupancy[not white]) & (enemy[ROOK] | enemy[QUEEN]) \
+            | bishop_attacks(king_sq, self.occupancy[not white]) & (enemy[BISHOP] | enemy[QUEEN])
+
+        pins = {}
+        for sniper in squares_of(snipers):
+            blockers = BETWEEN[king_sq][sniper] & self.occupied
+
+            #Exactly one piece of the same team is in the way
+            if blockers & own and not blockers & (blockers - 1):
+                pins[lsb(blockers)] = BETWEEN[king_sq][sniper] | BIT[sniper]
+
+        for piece in (self.wp if white else self.bp):
+            if piece.captured:
+                continue
+
+            x, y = piece.location
+            frm = y * 8 + x
+
+            if piece.kind == KING:
+                targets = KING_ATTACKS[king_sq] & ~own
+                if checkers:
+                    #The King cannot hide behind itself on the checking ray
+                    without_king = self.occupied ^ king_bb
+                    targets = sum(BIT[sq] for sq in squares_of(targets) \
+                        if not self.square_attacked(sq, not white, without_king))
+                elif targets:
+                    targets &= ~self.attack_map(not white)
+            elif allowed:
+                targets = piece.move_targets(self) & allowed & pins.get(frm, FULL)
+            else:
+                continue
+
+            frm <<= 6
+            for to in squares_of(targets):
+                game_boards.append(frm | to)    #{Old square, new square}
+
+        #Shuffle the list so the same move is not chosen on ties
+        if shuffle:
+            random.shuffle(game_boards)
+
+        return game_boards
+
+    def search_moves(self, white, shuffle=True):
+        """ Gets the moves the AIs search for a player.
+
+        Only legal moves are searched, so the King is never left in
+        check and the search does not look at lines that end with a
+        captured King.
+
+        Parameters
+        ----------
+        white : bool
+            True for the white player, False for the black player
+        shuffle : bool, optional
+            shuffle the moves so ties are broken randomly (default is True)
+
+        Returns
+        -------
+        array.array
+            the moves packed by bitboard.encode_move
+        """
+
+        return self.legal_moves(white, shuffle)
+
+    def capture_moves(self, white):
+        """ Gets the moves that capture a piece of the other team.
+
+        Used by the quiescence search, which only looks at captures.
+
+        Parameters
+        ----------
+        white : bool
+            True for the white player, False for the black player
+
+        Returns
+        -------
+        array.array
+            the captures packed by bitboard.encode_move
+        """
+
+        captures = array('H')
+        enemy = self.occupancy[not white]
+
+        #Only the attacks that land on the other team are generated
+        for piece in (self.wp if white else self.bp):
+            if not piece.captured:
+                x, y = piece.location
+                frm = (y * 8 + x) << 6
+                for to in squares_of(piece.attacks(self) & enemy):
+                    captures.append(frm | to)
+
+        return captures
+
+    def king_captured(self):
+        """ Checks if either King has been captured.
+        
+        Returns
+        -------
+        bool
+            True if a King has been captured, otherwise False
+        """
+
+        if not self.bitboards[True][KING] or not self.bitboards[False][KING]:
+            return True
+
+        return False
+
+    def get_game_status(self):
+        """ Checks both end game conditions.
+        
+        Returns
+        -------
+        bool
+            True if a either condition met, False if both
+            are not met
+        """
+
+        if not self.pieces_left() or self.king_captured():
+            self.game_over = True
+        
+        return self.game_over
+
+    def evaluate_score(self):
+        """ Gets the score of the current board.
+
+        The score is kept up to date by make_move and unmake_move, so
+        reading it does not look at the pieces.
+        
+        Returns
+        -------
+        int
+            the material and piece-square score of the board, positive
+            when the white player (MAX) is ahead
+        """
+
+        return self.score
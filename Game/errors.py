@@ -1,15 +1,32 @@
-class AIDoesNotExist(Exception):
-    """ Custom exception for AI selection. 
-    
-    There are only two AIs, so the user must
-    select a valid number.
-    """
-    pass
-
-class TooManyMoves(Exception):
-    """ Custom exception for AI move depth. 
-    
-    The AIs become too slow to play if the
-    look ahead depth is set too high.
-    """
-    pass
+class AIDoesNotExist(Exception):
+    """ Custom exception for AI selection. 
+    
+    There are only two AIs, so the user must
+    select a valid number.
+    """
+    pass
+
+class TooManyMoves(Exception):
+    """ Custom exception for AI move depth. 
+    
+    The AIs become too slow to play if the
+    look ahead depth is set too high.
+    """
+    pass
+
+class InvalidFEN(ValueError):
+    """ Custom exception for loading a position.
+
+    Raised when a FEN string does not describe
+    a position this game can play.
+    """
+    pass
+
+class SearchTimeout(Exception):
+    """ Custom exception for a timed search.
+
+    Raised inside the search when the time budget
+    for a move runs out, so the unfinished depth
+    can be thrown away.
+    """
+    pass
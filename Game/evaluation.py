@@ -0,0 +1,127 @@
+""" Piece-square tables used to score chess positions.
+
+Every (team, piece kind, square) has a score made of the point value of
+the piece and a bonus for the square it stands on. White pieces score
+positive and black pieces score negative, so the score of a position is
+the sum of the scores of everything in it, and a move only needs to take
+out the scores of what changed and add in what is new.
+
+The tables are written from the white side of the board, top row first,
+which is the same order as the squares. Black uses the mirrored square.
+"""
+
+from bitboard import KING, QUEEN, ROOK, KNIGHT, BISHOP, PAWN
+from king import King
+from queen import Queen
+from rook import Rook
+from knight import Knight
+from bishop import Bishop
+from pawn import Pawn
+
+#Point value of each kind of piece, indexed by the bitboard kind
+PIECE_VALUES = [King.value, Queen.value, Rook.value, Knight.value, Bishop.value, Pawn.value]
+
+#Square bonuses for the white side, indexed [kind][square]
+SQUARE_BONUS = [None] * 6
+
+#The King stays behind its Pawns
+SQUARE_BONUS[KING] = [
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -30, -40, -40, -50, -50, -40, -40, -30,
+    -20, -30, -30, -40, -40, -30, -30, -20,
+    -10, -20, -20, -20, -20, -20, -20, -10,
+     20,  20,   0,   0,   0,   0,  20,  20,
+     20,  30,  10,   0,   0,  10,  30,  20,
+]
+
+SQUARE_BONUS[QUEEN] = [
+    -20, -10, -10,  -5,  -5, -10, -10, -20,
+    -10,   0,   0,   0,   0,   0,   0, -10,
+    -10,   0,   5,   5,   5,   5,   0, -10,
+     -5,   0,   5,   5,   5,   5,   0,  -5,
+      0,   0,   5,   5,   5,   5,   0,  -5,
+    -10,   5,   5,   5,   5,   5,   0, -10,
+    -10,   0,   5,   0,   0,   0,   0, -10,
+    -20, -10, -10,  -5,  -5, -10, -10, -20,
+]
+
+#Rooks like open files and the seventh row
+SQUARE_BONUS[ROOK] = [
+      0,   0,   0,   0,   0,   0,   0,   0,
+      5,  10,  10,  10,  10,  10,  10,   5,
+     -5,   0,   0,   0,   0,   0,   0,  -5,
+     -5,   0,   0,   0,   0,   0,   0,  -5,
+     -5,   0,   0,   0,   0,   0,   0,  -5,
+     -5,   0,   0,   0,   0,   0,   0,  -5,
+     -5,   0,   0,   0,   0,   0,   0,  -5,
+      0,   0,   0,   5,   5,   0,   0,   0,
+]
+
+#Knights are strongest in the center
+SQUARE_BONUS[KNIGHT] = [
+    -50, -40, -30, -30, -30, -30, -40, -50,
+    -40, -20,   0,   0,   0,   0, -20, -40,
+    -30,   0,  10,  15,  15,  10,   0, -30,
+    -30,   5,  15,  20,  20,  15,   5, -30,
+    -30,   0,  15,  20,  20,  15,   0, -30,
+    -30,   5,  10,  15,  15,  10,   5, -30,
+    -40, -20,   0,   5,   5,   0, -20, -40,
+    -50, -40, -30, -30, -30, -30, -40, -50,
+]
+
+SQUARE_BONUS[BISHOP] = [
+    -20, -10, -10, -10, -10, -10, -10, -20,
+    -10,   0,   0,   0,   0,   0,   0, -10,
+    -10,   0,   5,  10,  10,   5,   0, -10,
+    -10,   5,   5,  10,  10,   5,   5, -10,
+    -10,   0,  10,  10,  10,  10,   0, -10,
+    -10,  10,  10,  10,  10,  10,  10, -10,
+    -10,   5,   0,   0,   0,   0,   5, -10,
+    -20, -10, -10, -10, -10, -10, -10, -20,
+]
+
+#Pawns move forward and hold the center
+SQUARE_BONUS[PAWN] = [
+      0,   0,   0,   0,   0,   0,   0,   0,
+     50,  50,  50,  50,  50,  50,  50,  50,
+     10,  10,  20,  30,  30,  20,  10,  10,
+      5,   5,  10,  25,  25,  10,   5,   5,
+      0,   0,   0,  20,  20,   0,   0,   0,
+      5,  -5, -10,   0,   0, -10,  -5,   5,
+      5,  10,  10, -20, -20,  10,  10,   5,
+      0,   0,   0,   0,   0,   0,   0,   0,
+]
+
+#Signed score of a piece on a square, indexed [white][kind][square]
+PIECE_SCORES = [
+    [[-(PIECE_VALUES[kind] + SQUARE_BONUS[kind][sq ^ 56]) for sq in range(64)] for kind in range(6)],
+    [[PIECE_VALUES[kind] + SQUARE_BONUS[kind][sq] for sq in range(64)] for kind in range(6)],
+]
+
+
+def board_score(board_obj):
+    """ Calculates the score of a board from scratch.
+
+    The board keeps its score up to date as moves are made, so this
+    is only needed when a board is set up.
+
+    Parameters
+    ----------
+    board_obj : board.Board
+        the board object that was created
+
+    Returns
+    -------
+    int
+        the score of the position, positive when white is ahead
+    """
+
+    score = 0
+
+    for sq, piece in enumerate(board_obj.squares):
+        if piece is not None:
+            score += PIECE_SCORES[piece.white][piece.kind][sq]
+
+    return score
@@ -0,0 +1,160 @@
+""" Move ordering for the alpha-beta search.
+
+Alpha-beta prunes the most when the best move is searched first, so the
+moves of each position are sorted before they are searched:
+
+1. the best move stored in the transposition table (hash move)
+2. captures, most valuable victim first and least valuable attacker next
+3. killer moves, quiet moves that caused a cutoff at the same ply
+4. the other quiet moves by their history score
+
+The quiescence search only has captures, which are sorted with
+order_captures.
+"""
+
+import random
+
+HASH_SCORE = 1 << 30
+CAPTURE_SCORE = 1 << 24
+KILLER_SCORE = 1 << 22     #History scores are kept below this
+
+MAX_PLY = 128
+
+
+class MoveOrderer():
+    """ A class to sort the moves of a position for the alpha-beta search.
+
+    Attributes
+    ----------
+    rng : random.Random
+        used to shuffle moves with the same score
+    killers : list
+        the two latest killer moves of each ply
+    history : list
+        cutoff scores of quiet moves, indexed by [white][from * 64 + to]
+
+    Methods
+    -------
+    order(moves, board, ply, hash_move=0)
+        returns the moves sorted with the best moves first
+    cutoff(move, white, ply, remaining)
+        records a quiet move that caused a beta cutoff
+    new_search()
+        ages the history scores before a new search
+    """
+
+    def __init__(self, seed=None):
+        """
+        Parameters
+        ----------
+        seed : int, optional
+            seed for shuffling moves with the same score (default is None)
+        """
+
+        self.rng = random.Random(seed)
+        self.killers = [[0, 0] for ply in range(MAX_PLY)]
+        self.history = [[0] * 4096, [0] * 4096]
+
+    def order(self, moves, board, ply, hash_move=0):
+        """ Sorts the moves with the moves most likely to be best first.
+
+        Moves with the same score are shuffled, so the same move is
+        not always chosen on ties.
+
+        Parameters
+        ----------
+        moves : array.array
+            the moves packed by bitboard.encode_move
+        board : board.Board
+            the Board object that stores the matrix for the game
+        ply : int
+            how many moves the position is from the root
+        hash_move : int, optional
+            the packed best move from the transposition table (default is 0)
+
+        Returns
+        -------
+        list
+            the sorted moves
+        """
+
+        if not moves:
+            return []
+        self.rng.shuffle(moves)     #Random order between equal scores
+
+        killer_1, killer_2 = self.killers[ply]
+        squares = board.squares
+        history = self.history[squares[moves[0] >> 6].white]   #Every move is of one team
+        scores = {}
+
+        for move in moves:
+            victim = squares[move & 63]
+
+            if move == hash_move:
+                scores[move] = HASH_SCORE
+            elif victim is not None:
+                #Most valuable victim, least valuable attacker
+                scores[move] = CAPTURE_SCORE + 16 * victim.value - squares[move >> 6].value
+            elif move == killer_1 or move == killer_2:
+                scores[move] = KILLER_SCORE
+            else:
+                scores[move] = history[move]
+
+        #Stable sort, so equal scores keep the shuffled order
+        return sorted(moves, key=scores.__getitem__, reverse=True)
+
+    def cutoff(self, move, white, ply, remaining):
+        """ Records a quiet move that caused a beta cutoff.
+
+        Parameters
+        ----------
+        move : int
+            the move packed by bitboard.encode_move
+        white : bool
+            True if the white player made the move
+        ply : int
+            how many moves the position is from the root
+        remaining : int
+            how many moves were searched below the position
+        """
+
+        #Keep the two latest different killers
+        killers = self.killers[ply]
+        if killers[0] != move:
+            killers[1] = killers[0]
+            killers[0] = move
+
+        #Deeper cutoffs are worth more
+        history = self.history[white]
+        history[move] = min(history[move] + remaining * remaining, KILLER_SCORE - 1)
+
+    def new_search(self):
+        """ Halves the history scores so newer cutoffs count for more. """
+
+        for history in self.history:
+            for i in range(4096):
+                if history[i]:
+                    history[i] >>= 1
+
+
+def order_captures(moves, board):
+    """ Sorts captures with the most valuable victim and least valuable attacker first.
+
+    Parameters
+    ----------
+    moves : array.array
+        the captures packed by bitboard.encode_move
+    board : board.Board
+        the Board object that stores the matrix for the game
+
+    Returns
+    -------
+    list
+        the sorted captures
+    """
+
+    squares = board.squares
+
+    #Most valuable victim, least valuable attacker
+    return sorted(moves, key=lambda move: \
+        16 * squares[move & 63].value - squares[move >> 6].value, reverse=True)
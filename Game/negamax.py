@@ -0,0 +1,625 @@
+""" The negamax search core shared by the minimax and alpha-beta AIs.
+
+Scores inside the search are from the view of the player to move, so one
+loop searches for both players: the window is negated and swapped on the
+way down and the child score is negated on the way up. The board score
+is from the view of the white player, so it is multiplied by the sign of
+the player to move.
+
+The search returns its score and principal variation instead of storing
+them, and everything it counts or records, such as the triangular table
+of principal variations, is kept in its SearchContext, so several
+searches can run at the same time, each with its own board and context.
+The evaluation, move ordering, pruning and reductions are hooks of the
+context, so they can be changed without touching the search loop.
+"""
+
+import time
+from array import array
+from bitboard import KING, QUEEN, ROOK, KNIGHT, BISHOP, lsb
+from board import Board, NULL_MOVE
+from transposition import EXACT, LOWER, UPPER, NO_MOVE
+from move_ordering import MAX_PLY, order_captures
+from errors import SearchTimeout
+
+INF = float('inf')
+
+DELTA_MARGIN = 200  #Largest square bonus a capture can add to the victim value
+
+SELECTIVE_DEPTH = 3     #Null moves and reductions need this many moves left to search
+NULL_REDUCTION = 2      #Moves fewer searched after a null move, one more with 6 left
+LMR_MOVES = 3           #Quiet moves ordered after this many are searched less deeply
+LMR_LATE_MOVES = 8      #Quiet moves ordered after this many are reduced by two
+
+
+class PVTable():
+    """ A class to record the principal variation of every ply of a search.
+
+    The table is triangular: row ply holds the best line found from the
+    position at that ply, in columns ply to length[ply]. When a move
+    becomes the best of its position, the line of the ply below is
+    copied after it, so row 0 ends with the line of the whole search.
+
+    Attributes
+    ----------
+    moves : array.array
+        MAX_PLY rows of MAX_PLY packed moves
+    length : list
+        the column after the last move of each row
+
+    Methods
+    -------
+    clear(ply)
+        empties the line of a ply when its position is entered
+    update(ply, move)
+        records a new best move and the line below it
+    set_line(ply, line)
+        records a whole line for a ply
+    line(ply)
+        returns the line of a ply as a list
+    """
+
+    def __init__(self):
+        self.moves = array('H', bytes(2 * MAX_PLY * MAX_PLY))
+        self.length = [0] * (MAX_PLY + 1)
+
+    def clear(self, ply):
+        """ Empties the line of a ply when its position is entered.
+
+        Parameters
+        ----------
+        ply : int
+            how many moves the position is from the root
+        """
+
+        self.length[ply] = ply
+
+    def update(self, ply, move):
+        """ Records a new best move of a ply and the line below it.
+
+        Parameters
+        ----------
+        ply : int
+            how many moves the position is from the root
+        move : int
+            the move packed by bitboard.encode_move
+        """
+
+        moves = self.moves
+        row = ply * MAX_PLY
+        end = max(self.length[ply + 1], ply + 1)
+
+        moves[row + ply] = move
+        moves[row + ply + 1:row + end] = moves[row + MAX_PLY + ply + 1:row + MAX_PLY + end]
+        self.length[ply] = end
+
+    def set_line(self, ply, line):
+        """ Records a whole line for a ply, such as one taken from the table.
+
+        Parameters
+        ----------
+        ply : int
+            how many moves the position is from the root
+        line : list
+            the packed moves of the best line from the position
+        """
+
+        start = ply * MAX_PLY + ply
+        self.moves[start:start + len(line)] = array('H', line)
+        self.length[ply] = ply + len(line)
+
+    def line(self, ply):
+        """ Gets the line of a ply.
+
+        Parameters
+        ----------
+        ply : int
+            how many moves the position is from the root
+
+        Returns
+        -------
+        list
+            the packed moves of the best line from the position
+        """
+
+        row = ply * MAX_PLY
+        return list(self.moves[row + ply:row + self.length[ply]])
+
+
+class SearchContext():
+    """ A class to hold the settings, hooks and counts of one search.
+
+    Attributes
+    ----------
+    tt : transposition.TranspositionTable
+        table of searched positions (None if disabled)
+    evaluate : function
+        evaluate(board) returns the score of a position, positive when
+        the white player is ahead
+    orderer : move_ordering.MoveOrderer
+        sorts the moves with order(moves, board, ply, hash_move) and is
+        told about quiet cutoffs with cutoff(move, white, ply, depth)
+        (None to search the moves shuffled)
+    pruners : list
+        functions pruner(board, depth, alpha, beta, ply, in_check, ctx)
+        that return an integer score to prune a position with, or None to
+        search it
+    reduction : function
+        reduction(board, idx, depth) returns how many moves less deeply
+        to search a quiet move, called once the move is made (None for
+        no reductions)
+    alpha_beta : bool
+        prune with the alpha-beta window, False searches every move (minimax)
+    pvs : bool
+        search all but the first move of a position with a zero window
+    q_budget : int
+        the most quiescence positions the search may visit (0 if
+        quiescence is disabled)
+    follow : list
+        the principal variation of an earlier search from the root, its
+        moves are searched first while the search is still on the line
+    following : bool
+        True while the moves made from the root are the start of follow
+    pv : negamax.PVTable
+        the principal variation of every ply of the search
+    deadline : float
+        time.perf_counter() value when the search must stop (None if
+        the search is not timed)
+    stop : multiprocessing.Value
+        shared flag that stops the search when it is set (None if the
+        search is not stopped by another process)
+    nodes : int
+        the positions visited, including quiescence positions
+    q_nodes : int
+        the quiescence positions visited
+    cutoffs : int
+        the number of alpha-beta cutoffs
+    first_cutoffs : int
+        the number of alpha-beta cutoffs caused by the first move searched
+    researches : int
+        the number of zero window and reduced searches that had to be
+        searched again
+
+    Methods
+    -------
+    check_time()
+        counts a node and stops a search that is out of time
+    """
+
+    def __init__(self, tt=None, evaluate=Board.evaluate_score, orderer=None, pruners=(), \
+        reduction=None, alpha_beta=True, pvs=True, q_budget=0, deadline=None, stop=None, \
+        follow=()):
+
+        self.tt = tt
+        self.evaluate = evaluate
+        self.orderer = orderer
+        self.pruners = pruners
+        self.reduction = reduction
+        self.alpha_beta = alpha_beta
+        self.pvs = pvs
+        self.q_budget = q_budget
+        self.deadline = deadline
+        self.stop = stop
+
+        self.follow = follow
+        self.following = bool(follow)
+        self.pv = PVTable()
+
+        self.nodes = 0
+        self.q_nodes = 0
+        self.cutoffs = 0
+        self.first_cutoffs = 0
+        self.researches = 0
+
+    def check_time(self):
+        """ Counts a searched node and stops a search that is out of time.
+
+        The clock and the stop flag are only read every 1024 nodes to keep
+        the check cheap.
+
+        Raises
+        ------
+        SearchTimeout
+            If the deadline of the search has passed or the stop flag is set.
+        """
+
+        self.nodes += 1
+        if not self.nodes & 1023 and \
+            ((self.deadline is not None and time.perf_counter() > self.deadline) \
+            or (self.stop is not None and self.stop.value)):
+            raise SearchTimeout
+
+
+def negamax(board, depth, alpha, beta, ply, ctx):
+    """ Searches a position for the player to move and gets the best line.
+
+    Parameters
+    ----------
+    board : board.Board
+        the Board object that stores the matrix for the game
+    depth : int
+        how many moves to look ahead
+    alpha : int
+        the score the player to move is already sure of
+    beta : int
+        the score the other player is already sure of, from the view of
+        the player to move
+    ply : int
+        how many moves the position is from the root
+    ctx : negamax.SearchContext
+        the settings, hooks and counts of the search
+
+    Returns
+    -------
+    tuple
+        the score from the view of the player to move, and the principal
+        variation, the list of best moves from the position
+    """
+
+    score = _negamax(board, depth, alpha, beta, ply, ctx)
+    return score, ctx.pv.line(ply)
+
+def _negamax(board, depth, alpha, beta, ply, ctx):
+    """ Searches a position for the player to move.
+
+    Positions reached by a different move order are looked up in the
+    transposition table, so they are only searched again when the stored
+    search was not deep enough. Once no moves are left to search, the
+    captures are played out by the quiescence search, so a piece is not
+    counted as won when it can be taken back.
+
+    With pvs, the first move is searched with the whole window and the
+    other moves with a zero window, which only shows whether they beat
+    the first move. A move that does beat it is searched again with the
+    whole window for its score. Moves the reduction hook reduces are
+    searched again at full depth when they beat alpha.
+
+    While the search is on the principal variation of an earlier search,
+    its move is searched first, even before the hash move. The best move
+    of each position and the line below it are recorded in ctx.pv. With
+    pvs, positions searched with the whole window are not cut off by the
+    table, so their line is searched out. Without it, their line is
+    taken from the best moves stored in the table.
+
+    Parameters
+    ----------
+    board : board.Board
+        the Board object that stores the matrix for the game
+    depth : int
+        how many moves to look ahead
+    alpha : int
+        the score the player to move is already sure of
+    beta : int
+        the score the other player is already sure of, from the view of
+        the player to move
+    ply : int
+        how many moves the position is from the root
+    ctx : negamax.SearchContext
+        the settings, hooks and counts of the search
+
+    Returns
+    -------
+    int
+        the score from the view of the player to move
+    """
+
+    ctx.check_time()
+    ctx.pv.clear(ply)
+    white = board.white_turn
+
+    #The game is over, return the score
+    if board.king_captured():
+        return (1 if white else -1) * ctx.evaluate(board)
+
+    #No moves left to search, settle the captures
+    if depth <= 0:
+        if ctx.q_budget:
+            return quiescence(board, alpha, beta, ctx)
+        return (1 if white else -1) * ctx.evaluate(board)
+
+    #----- Check the transposition table -----
+    alpha_start, beta_start = alpha, beta
+    hash_move = NO_MOVE
+    tt = ctx.tt
+
+    if tt is not None:
+        entry = tt.probe(board.key)
+        if entry is not None:
+            hash_move = entry[3]    #Searched first when ordering moves
+
+            #The root is always searched so the best move is found, and
+            #with pvs so are principal variation nodes, for their line
+            if ply > 0 and entry[0] >= depth and (beta - alpha == 1 or not ctx.pvs):
+                stored, bound = entry[1], entry[2]
+                if bound == EXACT:
+                    if beta - alpha > 1:
+                        ctx.pv.set_line(ply, hash_line(board, depth, tt))
+                    return stored
+                elif bound == LOWER and stored > alpha:
+                    alpha = stored
+                elif bound == UPPER and stored < beta:
+                    beta = stored
+
+                #The stored bound is already outside the window
+                if alpha >= beta:
+                    return stored
+    #-----------------------------------------
+
+    in_check = board.square_attacked(lsb(board.bitboards[white][KING]), not white)
+
+    #A hook may prove the position is not worth searching
+    if ply > 0:
+        for pruner in ctx.pruners:
+            score = pruner(board, depth, alpha, beta, ply, in_check, ctx)
+            if score is not None:
+                return score
+
+    moves = board.search_moves(white, ctx.orderer is None)  #Legal moves only
+
+    #----- Principal variation of the earlier search first -----
+    if ctx.following:
+        if ply < len(ctx.follow) and ctx.follow[ply] in moves:
+            hash_move = ctx.follow[ply]
+            if ctx.orderer is None:
+                idx = moves.index(hash_move)
+                moves[0], moves[idx] = moves[idx], moves[0]
+        else:
+            ctx.following = False   #The line ends or left the position
+    #-----------------------------------------------------------
+
+    #Best moves first so more of the tree is pruned
+    if ctx.orderer is not None:
+        moves = ctx.orderer.order(moves, board, ply, hash_move)
+
+    best_score, best_move = -INF, NO_MOVE
+    squares = board.squares
+
+    for idx in range(len(moves)):
+        move = moves[idx]
+        quiet = squares[move & 63] is None
+        board.make_move(move)    #make the move in place
+
+        reduction = 0
+        if idx and quiet and not in_check and ctx.reduction is not None:
+            reduction = ctx.reduction(board, idx, depth)
+
+        if idx and (ctx.pvs or reduction) and alpha != -INF:
+            #Only prove that the move is no better than alpha
+            upper = alpha + 1 if ctx.pvs else beta
+            score = -_negamax(board, depth - 1 - reduction, -upper, -alpha, ply + 1, ctx)
+
+            if reduction and score > alpha:
+                ctx.researches += 1
+                score = -_negamax(board, depth - 1, -upper, -alpha, ply + 1, ctx)
+
+            if upper != beta and alpha < score < beta:
+                ctx.researches += 1
+                score = -_negamax(board, depth - 1, -beta, -alpha, ply + 1, ctx)
+        else:
+            score = -_negamax(board, depth - 1, -beta, -alpha, ply + 1, ctx)
+
+        board.unmake_move() #undo the move
+        ctx.following = False   #Only the first move can be on the line
+
+        #The first move is the best until one beats it, even if every move loses
+        if score > best_score or idx == 0:
+            best_score, best_move = score, move
+            ctx.pv.update(ply, move)
+
+        if ctx.alpha_beta:
+            if best_score > alpha:
+                alpha = best_score
+
+            #there is already a better move
+            if alpha >= beta:
+                ctx.cutoffs += 1
+                if idx == 0:
+                    ctx.first_cutoffs += 1
+
+                #Remember quiet moves that prune for other positions
+                if quiet and ctx.orderer is not None:
+                    ctx.orderer.cutoff(move, white, ply, depth)
+                break
+
+    #No legal moves is checkmate in check, otherwise a draw
+    if not moves:
+        best_score = -INF if in_check else 0
+
+    #----- Store the result in the transposition table -----
+    if tt is not None and abs(best_score) != INF:
+        if best_score <= alpha_start:
+            bound = UPPER   #No move reached alpha
+        elif best_score >= beta_start:
+            bound = LOWER   #The search was pruned
+        else:
+            bound = EXACT
+
+        tt.store(board.key, depth, best_score, bound, best_move)
+    #-------------------------------------------------------
+
+    return best_score
+
+def hash_line(board, depth, tt):
+    """ Follows the best moves stored in the table from a position.
+
+    Parameters
+    ----------
+    board : board.Board
+        the Board object that stores the matrix for the game
+    depth : int
+        the most moves to follow
+    tt : transposition.TranspositionTable
+        the table of searched positions
+
+    Returns
+    -------
+    list
+        the packed moves, up to the first position without a legal
+        stored move
+    """
+
+    line = []
+    while len(line) < depth:
+        entry = tt.probe(board.key)
+        if entry is None or entry[3] not in board.search_moves(board.white_turn, False):
+            break
+        board.make_move(entry[3])
+        line.append(entry[3])
+
+    for move in line:
+        board.unmake_move()     #Back to the position
+
+    return line
+
+def quiescence(board, alpha, beta, ctx):
+    """ Plays out the captures of a position to get a quiet score.
+
+    The player may stand pat and keep the current score instead of
+    capturing, so only captures that can raise the score past it are
+    searched. Captures that cannot reach alpha even with the whole victim
+    won are skipped (delta pruning). Once the search has visited q_budget
+    quiescence positions, the remaining positions only stand pat.
+
+    Parameters
+    ----------
+    board : board.Board
+        the Board object that stores the matrix for the game
+    alpha : int
+        the score the player to move is already sure of
+    beta : int
+        the score the other player is already sure of, from the view of
+        the player to move
+    ctx : negamax.SearchContext
+        the settings, hooks and counts of the search
+
+    Returns
+    -------
+    int
+        the best score the player to move can achieve with captures
+    """
+
+    white = board.white_turn
+    stand_pat = (1 if white else -1) * ctx.evaluate(board)
+
+    #The game is over or the budget is used up
+    if board.king_captured() or ctx.q_nodes >= ctx.q_budget:
+        return stand_pat
+
+    ctx.q_nodes += 1
+    if stand_pat >= beta:
+        return stand_pat    #Already too good for the other player
+
+    best_score = stand_pat
+    if best_score > alpha:
+        alpha = best_score
+
+    #Most valuable victims first
+    captures = order_captures(board.capture_moves(white), board)
+    squares = board.squares
+    king = board.bitboards[white]
+
+    for move in captures:
+        #Even winning the whole piece does not reach alpha
+        if stand_pat + squares[move & 63].value + DELTA_MARGIN <= alpha:
+            continue
+
+        ctx.check_time()
+        board.make_move(move)
+
+        #Captures are not checked for legality until they are made
+        if board.square_attacked(lsb(king[KING]), not white):
+            board.unmake_move()
+            continue
+
+        score = -quiescence(board, -beta, -alpha, ctx)
+        board.unmake_move()
+
+        if score > best_score:
+            best_score = score
+            if best_score > alpha:
+                alpha = best_score
+                if alpha >= beta:
+                    break
+
+    return best_score
+
+def null_move_prune(board, depth, alpha, beta, ply, in_check, ctx):
+    """ Prunes a position where the player still wins after passing the turn.
+
+    A move is almost always better than passing, so if a shallower search
+    after a pass still fails high, a real move would too. It is skipped
+    in check, right after another pass, and when the player only has
+    Pawns and the King, where passing can be better than any move
+    (zugzwang).
+
+    Parameters
+    ----------
+    board : board.Board
+        the Board object that stores the matrix for the game
+    depth : int
+        how many moves are left to search
+    alpha : int
+        the score the player to move is already sure of
+    beta : int
+        the score the other player is already sure of
+    ply : int
+        how many moves the position is from the root
+    in_check : bool
+        True if the King of the player to move is in check
+    ctx : negamax.SearchContext
+        the settings, hooks and counts of the search
+
+    Returns
+    -------
+    int
+        beta as an integer if the position is pruned, otherwise None
+    """
+
+    white = board.white_turn
+    pieces = board.bitboards[white]
+
+    if depth < SELECTIVE_DEPTH or in_check or abs(beta) == INF \
+        or (board.history and board.history[-1][3] & NULL_MOVE) \
+        or not pieces[QUEEN] | pieces[ROOK] | pieces[KNIGHT] | pieces[BISHOP] \
+        or (1 if white else -1) * ctx.evaluate(board) < beta:
+        return None
+
+    board.make_null_move()
+    score = -_negamax(board, depth - 1 - NULL_REDUCTION - (depth >= 6), -beta, 1 - beta, \
+        ply + 1, ctx)
+    board.unmake_move()
+
+    #A mate after a pass is not a real mate, so only the bound is returned,
+    #as an integer whatever the type of the window (beta is finite here)
+    return int(beta) if score >= beta else None
+
+def late_move_reduction(board, idx, depth):
+    """ Gets how many moves less deeply to search a late quiet move.
+
+    Moves ordered late are rarely the best, so they are searched less
+    deeply first. Moves that give check are not reduced.
+
+    Parameters
+    ----------
+    board : board.Board
+        the board after the move is made
+    idx : int
+        where the move was ordered, 0 for the first move
+    depth : int
+        how many moves were left to search before the move
+
+    Returns
+    -------
+    int
+        the number of moves to reduce the search by
+    """
+
+    if idx < LMR_MOVES or depth < SELECTIVE_DEPTH:
+        return 0
+
+    #The player to move now is the one the move may check
+    white = board.white_turn
+    if board.square_attacked(lsb(board.bitboards[white][KING]), not white):
+        return 0
+
+    return 1 if idx < LMR_LATE_MOVES else 2
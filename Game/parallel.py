@@ -0,0 +1,482 @@
+""" Root-split alpha-beta search over several processes.
+
+The moves of the root position are shared between worker processes. The
+first (eldest) move is searched on its own to get a bound, and only then
+are the other moves (young brothers) handed to the workers, so they start
+with a window instead of searching everything in full. The best score
+found so far is kept in shared memory, and each worker reads it when it
+starts a move, so later moves are searched with the tightest bound.
+
+Workers get the position as a Board.snapshot, a few bytes, instead of the
+piece objects, and each worker keeps its own AIVersions for the whole game.
+The workers can also share one transposition table in shared memory, so a
+position searched by one worker is a cutoff for the others.
+
+LazySMPSearch uses the shared table differently: every worker searches the
+whole root position, some one move deeper, and they only help each other
+through the table. The main process search gives the move, and the helpers
+are stopped when it is done.
+"""
+
+import os
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed, TimeoutError as WaitTimeout
+from ai_versions import AIVersions
+from board import Board
+from transposition import SharedTranspositionTable, NO_MOVE
+from errors import SearchTimeout
+
+_worker = {}    #State of a worker process, set by _init_worker
+
+INF_BOUND = 1 << 62     #Stands for an infinite score in the integer shared bound
+
+
+def _init_worker(bound, tt_size_mb, seed, tt_name=None, stop=None):
+    """ Sets up the AI of a worker process.
+
+    Parameters
+    ----------
+    bound : multiprocessing.Value
+        the best root score found so far packed by _pack_score, shared by
+        every process
+    tt_size_mb : int
+        memory for the transposition table of the worker in megabytes
+    seed : int
+        seed for breaking ties between equally ordered moves
+    tt_name : str, optional
+        name of a SharedTranspositionTable to attach to instead of
+        creating a table for the worker (default is None)
+    stop : multiprocessing.Value, optional
+        flag that stops the searches of the worker (default is None)
+    """
+
+    tt = SharedTranspositionTable(tt_size_mb, tt_name) if tt_name else None
+
+    #Workers with the same seed would search in the same order
+    if seed is not None:
+        seed += os.getpid()
+
+    _worker['ai'] = AIVersions(tt_size_mb, seed=seed, tt=tt)
+    _worker['ai'].stop = stop
+    _worker['bound'] = bound
+    _worker['snapshot'] = None
+    _worker['board'] = None
+    _worker['search'] = None
+
+def _worker_board(snapshot):
+    """ Gets the board of a worker process for a position.
+
+    Parameters
+    ----------
+    snapshot : bytes
+        the position packed by Board.snapshot
+
+    Returns
+    -------
+    board.Board
+        the board of the worker, kept while the position is the same
+    """
+
+    if _worker['snapshot'] != snapshot:
+        _worker['board'] = Board.from_snapshot(snapshot)
+        _worker['snapshot'] = snapshot
+
+    return _worker['board']
+
+def _pack_score(score):
+    """ Converts a score into an integer for the shared bound.
+
+    Parameters
+    ----------
+    score : int
+        the score, or an infinity for a King capture
+
+    Returns
+    -------
+    int
+        the score, with the infinities replaced by +-INF_BOUND
+    """
+
+    if abs(score) == float('inf'):
+        return INF_BOUND if score > 0 else -INF_BOUND
+    return int(score)
+
+def _unpack_score(value):
+    """ Converts an integer from the shared bound back into a score.
+
+    Parameters
+    ----------
+    value : int
+        the score packed by _pack_score
+
+    Returns
+    -------
+    int
+        the score, with +-INF_BOUND replaced by the infinities
+    """
+
+    if abs(value) == INF_BOUND:
+        return float('inf') if value > 0 else float('-inf')
+    return value
+
+def _raise_bound(bound, score, max_turn):
+    """ Stores a root score in the shared bound if it is better.
+
+    Parameters
+    ----------
+    bound : multiprocessing.Value
+        the best root score found so far packed by _pack_score
+    score : int
+        the score of a root move
+    max_turn : bool
+        True if the root player is the max player
+    """
+
+    score = _pack_score(score)
+    with bound.get_lock():
+        if (max_turn and score > bound.value) or (not max_turn and score < bound.value):
+            bound.value = score
+
+def _search_move(search_id, snapshot, move, max_turn, max_depth):
+    """ Searches one root move in a worker process.
+
+    Parameters
+    ----------
+    search_id : int
+        number of the root search, the tables age when it changes
+    snapshot : bytes
+        the root position packed by Board.snapshot
+    move : int
+        the root move packed by bitboard.encode_move
+    max_turn : bool
+        True if the root player is the max player
+    max_depth : int
+        how many moves the AI will look ahead
+
+    Returns
+    -------
+    tuple
+        the score of the move (None if the stop flag stopped the search),
+        True if the score is exact and not only a bound, and the number
+        of nodes searched
+    """
+
+    ai = _worker['ai']
+    if ai.stop is not None and ai.stop.value:
+        return None, False, 0   #Moves queued before the search was stopped
+
+    board = _worker_board(snapshot)
+
+    if _worker['search'] != search_id:
+        _worker['search'] = search_id
+        if ai.tt is not None:
+            ai.tt.new_search()
+        if ai.orderer is not None:
+            ai.orderer.new_search()
+
+    #Only a move better than the best so far matters
+    bound = _unpack_score(_worker['bound'].value)
+    if max_turn:
+        alpha, beta = bound, float('inf')
+    else:
+        alpha, beta = float('-inf'), bound
+
+    nodes = ai.nodes
+    ai.q_nodes = 0
+
+    board.make_move(move)
+    try:
+        score = ai.alpha_beta_pruning(not max_turn, max_depth, board, alpha, beta, 1)
+    except SearchTimeout:
+        #Undo the moves of the stopped search, its result is thrown away
+        while board.history:
+            board.unmake_move()
+        return None, False, ai.nodes - nodes
+    board.unmake_move()
+
+    #A score that does not beat the window only shows the move is no better
+    exact = score > alpha or alpha == float('-inf') if max_turn \
+        else score < beta or beta == float('inf')
+    if exact:
+        _raise_bound(_worker['bound'], score, max_turn)
+
+    return score, exact, ai.nodes - nodes
+
+def _lazy_helper(snapshot, max_turn, max_depth):
+    """ Searches the whole root position in a Lazy SMP helper process.
+
+    The search only fills the shared transposition table, and runs
+    until it finishes or the stop flag is set.
+
+    Parameters
+    ----------
+    snapshot : bytes
+        the root position packed by Board.snapshot
+    max_turn : bool
+        True if the root player is the max player
+    max_depth : int
+        how many moves the helper will look ahead
+
+    Returns
+    -------
+    int
+        the number of nodes searched
+    """
+
+    ai = _worker['ai']
+    board = _worker_board(snapshot)
+    nodes = ai.nodes
+
+    try:
+        ai.alpha_beta_pruning(max_turn, max_depth, board)
+    except SearchTimeout:
+        #Undo the moves of the stopped search
+        while board.history:
+            board.unmake_move()
+
+    return ai.nodes - nodes
+
+
+class ParallelSearch():
+    """ A class to split the alpha-beta root moves between processes.
+
+    Attributes
+    ----------
+    workers : int
+        the number of worker processes
+    ai : ai_versions.AIVersions
+        searches the eldest root move and orders the root moves
+    best_move : int
+        the best move found packed by bitboard.encode_move (None if the
+        player has no moves)
+    nodes : int
+        the number of positions visited by the searches in every process
+    shared_tt : bool
+        True if every process uses one transposition table in shared memory
+
+    Methods
+    -------
+    search(max_turn, max_depth, board)
+        returns the best score and updates the best move
+    close()
+        stops the worker processes
+    """
+
+    def __init__(self, workers=None, tt_size_mb=16, seed=None, shared_tt=False):
+        """
+        Parameters
+        ----------
+        workers : int, optional
+            the number of worker processes (default is the number of cores)
+        tt_size_mb : int, optional
+            memory for the transposition table of each process in megabytes
+            (default is 16)
+        seed : int, optional
+            seed for breaking ties between equally ordered moves (default is None)
+        shared_tt : bool, optional
+            share one transposition table of tt_size_mb between every
+            process instead of one table each (default is False)
+        """
+
+        self.workers = workers or os.cpu_count()
+        self.shared_tt = shared_tt
+        tt = SharedTranspositionTable(tt_size_mb) if shared_tt else None
+
+        self.ai = AIVersions(tt_size_mb, seed=seed, tt=tt)
+        self.best_move = None
+        self.nodes = 0
+
+        self._searches = 0
+        self._bound = multiprocessing.Value('q', 0)   #Integer, so the search windows stay integers
+        self._stop = multiprocessing.Value('b', 0)
+        self._pool = ProcessPoolExecutor(self.workers, initializer=_init_worker, \
+            initargs=(self._bound, tt_size_mb, seed, tt.name if tt else None, self._stop))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def search(self, max_turn, max_depth, board):
+        """ Chooses the best move with the root moves searched in parallel.
+
+        The arguments match AIVersions.alpha_beta_pruning, and the best
+        move is also given to self.ai, so the method can be given to
+        self.ai.iterative_deepening as the search. Its deadline stops
+        the workers too, and the search then raises SearchTimeout.
+
+        Parameters
+        ----------
+        max_turn : bool
+            True for the max player, False for the min player
+        max_depth : int
+            how many moves the AI will look ahead
+        board : board.Board
+            the Board object that stores the matrix for the game
+
+        Returns
+        -------
+        int
+            the best score that the player can achieve
+
+        Raises
+        ------
+        SearchTimeout
+            If self.ai.deadline passes before every root move is searched.
+        """
+
+        ai = self.ai
+        board.set_turn(max_turn)
+        choices = board.search_moves(max_turn, False)
+
+        #Checkmate or stalemate, and too little work to split
+        if len(choices) < 2 or max_depth < 2:
+            nodes = ai.nodes
+            score = ai.alpha_beta_pruning(max_turn, max_depth, board)
+            self.best_move = ai.best_move
+            self.nodes += ai.nodes - nodes
+            return score
+
+        self._searches += 1
+        if ai.tt is not None:
+            ai.tt.new_search()
+
+        #Best moves first, so the eldest brother sets a good bound
+        hash_move = NO_MOVE
+        if ai.tt is not None:
+            entry = ai.tt.probe(board.key)
+            if entry is not None:
+                hash_move = entry[3]
+        if ai.orderer is not None:
+            ai.orderer.new_search()
+            choices = ai.orderer.order(choices, board, 0, hash_move)
+
+        #----- Young brothers wait for the eldest -----
+        nodes = ai.nodes
+        ai.q_nodes = 0
+        board.make_move(choices[0])
+        try:
+            best_score = ai.alpha_beta_pruning(not max_turn, max_depth, board, \
+                float('-inf'), float('inf'), 1)
+        finally:
+            board.unmake_move()
+        self.nodes += ai.nodes - nodes
+        best_idx = 0
+
+        #A King capture or checkmate for the player cannot be beaten
+        if best_score != (float('inf') if max_turn else float('-inf')):
+            self._bound.value = _pack_score(best_score)
+            snapshot = board.snapshot()
+
+            self._stop.value = 0
+            futures = {}
+            for idx in range(1, len(choices)):
+                futures[self._pool.submit(_search_move, self._searches, snapshot, \
+                    choices[idx], max_turn, max_depth)] = idx
+
+            pending = set(futures)
+            timeout = None if ai.deadline is None else max(0, ai.deadline - time.perf_counter())
+            try:
+                for future in as_completed(futures, timeout):
+                    pending.discard(future)
+                    score, exact, nodes = future.result()
+                    self.nodes += nodes
+
+                    #Scores that do not beat the window are only bounds themselves
+                    if exact and ((max_turn and score > best_score) \
+                        or (not max_turn and score < best_score)):
+                        best_score = score
+                        best_idx = futures[future]
+
+            except WaitTimeout:
+                #The workers stop within 1024 nodes, and the depth is thrown away
+                self._stop.value = 1
+                for future in pending:
+                    if not future.cancel():     #Moves not started are dropped
+                        self.nodes += future.result()[2]
+                raise SearchTimeout from None
+        #----------------------------------------------
+
+        self.best_move = choices[best_idx]
+
+        #The workers only return scores, so the line is the move alone
+        ai.best_move, ai.pv, ai.pv_key = self.best_move, [self.best_move], board.key
+
+        return best_score
+
+    def close(self):
+        """ Stops the worker processes and frees the shared table. """
+
+        self._pool.shutdown()
+        if self.shared_tt:
+            self.ai.tt.close()
+
+
+class LazySMPSearch(ParallelSearch):
+    """ A class to search with helper processes that share a transposition table.
+
+    Every helper searches the whole root position, half of them one move
+    deeper, and writes what it finds to the shared table. The search of
+    the main process reads those results as cutoffs and gives the move.
+
+    Methods
+    -------
+    search(max_turn, max_depth, board)
+        returns the best score and updates the best move
+    """
+
+    def __init__(self, workers=None, tt_size_mb=16, seed=None):
+        """
+        Parameters
+        ----------
+        workers : int, optional
+            the number of helper processes (default is the number of cores)
+        tt_size_mb : int, optional
+            memory for the shared transposition table in megabytes (default is 16)
+        seed : int, optional
+            seed for breaking ties between equally ordered moves (default is None)
+        """
+
+        super().__init__(workers, tt_size_mb, seed, shared_tt=True)
+
+    def search(self, max_turn, max_depth, board):
+        """ Chooses the best move while the helpers fill the shared table.
+
+        Parameters
+        ----------
+        max_turn : bool
+            True for the max player, False for the min player
+        max_depth : int
+            how many moves the AI will look ahead
+        board : board.Board
+            the Board object that stores the matrix for the game
+
+        Returns
+        -------
+        int
+            the best score that the player can achieve
+        """
+
+        ai = self.ai
+        board.set_turn(max_turn)
+        snapshot = board.snapshot()
+
+        #Different depths make the helpers search different parts of the tree
+        self._stop.value = 0
+        helpers = [self._pool.submit(_lazy_helper, snapshot, max_turn, max_depth + (i & 1)) \
+            for i in range(self.workers)]
+
+        nodes = ai.nodes
+        try:
+            score = ai.alpha_beta_pruning(max_turn, max_depth, board)
+        finally:
+            #The helpers stop within 1024 nodes
+            self._stop.value = 1
+            for helper in helpers:
+                self.nodes += helper.result()
+
+        self.nodes += ai.nodes - nodes
+        self.best_move = ai.best_move
+        return score
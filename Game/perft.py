@@ -0,0 +1,195 @@
+""" Perft (performance test) for the move generator.
+
+Perft counts the leaf nodes of the full move tree to a fixed depth. The
+counts only change when the moves the AIs search change, so a suite of
+positions with known counts checks that an optimisation of the move
+generator gives the same results, and the nodes per second measure how
+fast it is.
+
+Run the file to check the suite, or divide a position to see the count
+below each move:
+
+    python perft.py --depth 3
+    python perft.py --divide 3 --moves e2e4 e7e5
+    python perft.py --divide 2 --fen "4k3/8/8/8/8/8/4P3/4K3 w - - 0 1"
+"""
+
+import argparse
+import time
+from board import Board, START_FEN
+from bitboard import move_name, parse_move
+
+#(name, FEN of the position, leaf nodes at depth 1, 2, 3...)
+#The counts follow the rules of this game: there is no castling, en passant
+#or promotion, and no move may leave the King in check. Up to depth 4 from
+#the start none of the missing rules come up, so the counts match chess.
+SUITE = [
+    ('start', START_FEN, [20, 400, 8902, 197281]),
+    ('open game', 'r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w - - 0 3', \
+        [27, 835, 23926]),
+    ('queen attack', 'r1bqkb1r/pppp1ppp/2n2n2/4p2Q/2B1P3/8/PPPP1PPP/RNB1K1NR w - - 0 4', \
+        [43, 1133, 45611]),
+    ('black checkmated', 'rnbqkbnr/ppppp2p/5p2/6pQ/3PP3/8/PPP2PPP/RNB1KBNR b - - 0 3', \
+        [0, 0, 0]),
+    ('king walk', 'rnbq1bnr/ppppkppp/8/4p3/4P3/8/PPPPKPPP/RNBQ1BNR w - - 0 3', \
+        [23, 531, 13337]),
+]
+
+
+def new_board(moves=(), fen=START_FEN):
+    """ Creates a board from a position and plays moves on it.
+
+    Parameters
+    ----------
+    moves : list, optional
+        moves in coordinate notation, like 'e2e4' (default is no moves)
+    fen : str, optional
+        the position to start from (default is the starting position)
+
+    Returns
+    -------
+    board.Board
+        the board after the moves, with the next player to move
+
+    Raises
+    ------
+    ValueError
+        If the FEN is not valid, or a move is not one of the moves the
+        AIs would search.
+    """
+
+    board = Board.from_fen(fen)
+
+    for name in moves:
+        move = parse_move(name)
+
+        if move not in board.search_moves(board.white_turn, False):
+            raise ValueError('{} is not a move in this position'.format(name))
+
+        board.make_move(move)
+
+    return board
+
+def perft(board, depth):
+    """ Counts the leaf nodes of the move tree below a position.
+
+    The moves are the legal moves the AIs search for the player whose
+    turn it is.
+
+    Parameters
+    ----------
+    board : board.Board
+        the Board object that stores the position
+    depth : int
+        how many moves to look ahead
+
+    Returns
+    -------
+    int
+        the number of positions at the depth
+    """
+
+    if depth == 0:
+        return 1
+
+    moves = board.search_moves(board.white_turn, False)
+
+    #Every move leads to a leaf, so there is no need to make them
+    if depth == 1:
+        return len(moves)
+
+    nodes = 0
+    for move in moves:
+        board.make_move(move)
+        nodes += perft(board, depth - 1)
+        board.unmake_move()
+
+    return nodes
+
+def divide(board, depth):
+    """ Prints the perft count below each move of a position.
+
+    Comparing the counts of two move generators move by move shows
+    which move they disagree on.
+
+    Parameters
+    ----------
+    board : board.Board
+        the Board object that stores the position
+    depth : int
+        how many moves to look ahead, at least 1
+
+    Returns
+    -------
+    dict
+        the count below each move in coordinate notation
+    """
+
+    counts = {}
+
+    for move in board.search_moves(board.white_turn, False):
+        name = move_name(move)
+        board.make_move(move)
+        counts[name] = perft(board, depth - 1)
+        board.unmake_move()
+
+    for name in sorted(counts):
+        print('{}: {}'.format(name, counts[name]))
+    print('\nMoves: {}\nNodes: {}'.format(len(counts), sum(counts.values())))
+
+    return counts
+
+def run_suite(max_depth=3):
+    """ Runs perft on every position of the suite and reports the speed.
+
+    Parameters
+    ----------
+    max_depth : int, optional
+        the deepest count to check for each position (default is 3)
+
+    Returns
+    -------
+    bool
+        True if every count matches the expected count
+    """
+
+    passed = True
+    total_nodes = 0
+    total_time = 0
+
+    for name, fen, expected in SUITE:
+        board = Board.from_fen(fen)
+
+        for depth in range(1, min(max_depth, len(expected)) + 1):
+            start = time.perf_counter()
+            nodes = perft(board, depth)
+            elapsed = time.perf_counter() - start
+
+            total_nodes += nodes
+            total_time += elapsed
+
+            ok = nodes == expected[depth - 1]
+            passed = passed and ok
+
+            print('{:<16} depth {}  nodes {:>9}  expected {:>9}  {:>9.0f} nps  {}' \
+                .format(name, depth, nodes, expected[depth - 1], \
+                nodes / elapsed if elapsed else 0, 'ok' if ok else 'FAIL'))
+
+    print('\nTotal: {} nodes in {:.2f}s ({:.0f} nps)'.format(total_nodes, total_time, \
+        total_nodes / total_time if total_time else 0))
+
+    return passed
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Perft counts for the move generator.')
+    parser.add_argument('--depth', type=int, default=3, help='deepest suite count to check')
+    parser.add_argument('--divide', type=int, metavar='DEPTH', help='divide a position instead')
+    parser.add_argument('--fen', default=START_FEN, help='position to divide (default is the start)')
+    parser.add_argument('--moves', nargs='*', default=[], help='moves from the position, like e2e4')
+    args = parser.parse_args()
+
+    if args.divide:
+        divide(new_board(args.moves, args.fen), args.divide)
+    elif not run_suite(args.depth):
+        raise SystemExit(1)
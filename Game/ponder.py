@@ -0,0 +1,214 @@
+""" Pondering, searching on the opponent's time.
+
+After the AI chooses a move, the second move of its principal variation
+is the reply it expects, or the best move stored in the transposition
+table after its move when the line is too short. A Ponderer plays both moves on a copy of the
+board and searches the position after them in a background thread while
+the game has nothing else to do, such as while the move is shown.
+
+The ponder search is made by the AI itself, so it fills the same
+transposition table, killers and history. The best move and principal
+variation of the AI are put back when the ponder search is stopped.
+When the expected reply is played, the next search of the player starts
+from that work: a fixed depth search the ponder search already finished
+is not searched again, and a timed search gets its shallow depths from
+the table.
+
+Python threads share one interpreter lock, so pondering only gains the
+time the game spends waiting. The ponder search is stopped before the AI
+searches again, so two searches never write to the table at once.
+"""
+
+import ctypes
+import threading
+from board import Board
+from negamax import hash_line
+
+
+class Ponderer():
+    """ A class to search the expected position of an AI in the background.
+
+    Attributes
+    ----------
+    ai : ai_versions.AIVersions
+        the AI that ponders, its table and move ordering are shared
+    results : dict
+        (key, stats, pv) of the last finished ponder search of each
+        player, indexed by True for white and False for black
+    hits : int
+        the searches that used a ponder search
+    misses : int
+        the searches where the opponent did not play the expected reply
+
+    Methods
+    -------
+    ponder(max_turn, board, max_depth=64, minimax=False)
+        starts searching the position after the expected reply
+    stop()
+        stops the ponder search, keeps what it finished and puts back the move
+    search(max_turn, board, max_depth=None, time_budget=None, minimax=False)
+        returns the statistics of a search, using the ponder search on a hit
+    """
+
+    def __init__(self, ai):
+        """
+        Parameters
+        ----------
+        ai : ai_versions.AIVersions
+            the AI to ponder with
+        """
+
+        self.ai = ai
+        self.results = {}
+        self.hits = 0
+        self.misses = 0
+
+        self._thread = None
+        self._stop = ctypes.c_bool(False)   #Read by the search every 1024 nodes
+        self._chosen = None     #best_move, pv and pv_key of the search before pondering
+
+    def ponder(self, max_turn, board, max_depth=64, minimax=False):
+        """ Starts searching the position after the expected reply.
+
+        Call it after the AI searched for max_turn, and stop it before the
+        move is made, as the ponder search replaces the best move of the
+        AI until then. Nothing is started when neither the principal
+        variation nor the table has a reply.
+
+        Parameters
+        ----------
+        max_turn : bool
+            True for the max player, False for the min player
+        board : board.Board
+            the Board object that stores the matrix for the game
+        max_depth : int, optional
+            the deepest search to try, the depth of the next search when
+            it is fixed (default is 64)
+        minimax : bool, optional
+            use minimax instead of alpha-beta pruning (default is False)
+
+        Returns
+        -------
+        bool
+            True if a ponder search was started
+        """
+
+        self.stop()
+
+        pv = self.ai.pv
+        if not pv or self.ai.pv_key != board.key:
+            return False
+
+        #The move and the expected reply, on a board the game does not use
+        ponder_board = Board.from_snapshot(board.snapshot())
+        ponder_board.make_move(pv[0])
+
+        reply = pv[1:2]
+        if not reply and self.ai.tt is not None:
+            reply = hash_line(ponder_board, 1, self.ai.tt)
+        if not reply:
+            return False
+        ponder_board.make_move(reply[0])
+
+        self._chosen = self.ai.best_move, pv, self.ai.pv_key
+        self._stop.value = False
+        self.ai.stop = self._stop
+        self._thread = threading.Thread(target=self._run, \
+            args=(max_turn, ponder_board, max_depth, minimax), daemon=True)
+        self._thread.start()
+
+        return True
+
+    def _run(self, max_turn, board, max_depth, minimax):
+        """ Runs a ponder search until it finishes or is stopped.
+
+        Parameters
+        ----------
+        max_turn : bool
+            True for the max player, False for the min player
+        board : board.Board
+            the position after the expected reply
+        max_depth : int
+            the deepest search to try
+        minimax : bool
+            use minimax instead of alpha-beta pruning
+        """
+
+        key = board.key
+        stats_log, self.ai.stats_log = self.ai.stats_log, None    #Only real searches are logged
+
+        try:
+            stats = self.ai.search(max_turn, board, max_depth, float('inf'), minimax)
+        finally:
+            self.ai.stats_log = stats_log
+
+        if stats.depth:
+            self.results[max_turn] = (key, stats, self.ai.pv)
+
+    def stop(self):
+        """ Stops the ponder search and puts back the move the AI chose.
+
+        Waits for the search to keep the depths it finished.
+        """
+
+        if self._thread is not None:
+            self._stop.value = True
+            self._thread.join()
+            self._thread = None
+            self.ai.stop = None
+            self.ai.best_move, self.ai.pv, self.ai.pv_key = self._chosen
+
+    def search(self, max_turn, board, max_depth=None, time_budget=None, minimax=False):
+        """ Searches for the best move, starting from the ponder search on a hit.
+
+        Takes the same parameters as AIVersions.search. When the opponent
+        played the expected reply and the search has a fixed depth the
+        ponder search finished, its result is used without searching.
+
+        Parameters
+        ----------
+        max_turn : bool
+            True for the max player, False for the min player
+        board : board.Board
+            the Board object that stores the matrix for the game
+        max_depth : int, optional
+            how many moves the AI will look ahead (default is 3, or 64
+            with a budget)
+        time_budget : int, optional
+            milliseconds the search may use with iterative deepening
+            (default is None)
+        minimax : bool, optional
+            use minimax instead of alpha-beta pruning (default is False)
+
+        Returns
+        -------
+        search_stats.SearchStats
+            the result and statistics of the search, best_move is updated
+        """
+
+        self.stop()
+        board.set_turn(max_turn)
+
+        result = self.results.pop(max_turn, None)
+        if result is None:
+            return self.ai.search(max_turn, board, max_depth, time_budget, minimax)
+
+        key, stats, pv = result
+        if key != board.key:
+            self.misses += 1
+            return self.ai.search(max_turn, board, max_depth, time_budget, minimax)
+
+        self.hits += 1
+        self.ai.pv, self.ai.pv_key = pv, key    #The line is searched first again
+
+        if time_budget is None and stats.depth >= (max_depth or 3):
+            self.ai.best_move = pv[0] if pv else None
+            stats.ponder_hit = True     #The counts and time are those of the ponder search
+
+            if self.ai.stats_log is not None:
+                stats.write(self.ai.stats_log)
+            return stats
+
+        stats = self.ai.search(max_turn, board, max_depth, time_budget, minimax)
+        stats.ponder_hit = True
+        return stats
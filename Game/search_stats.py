@@ -0,0 +1,215 @@
+""" Statistics of an AI search.
+
+Every search made with AIVersions.search returns a SearchStats with the
+counts of the search, and can write them as one JSON line per search so
+a game or a tournament can be measured afterwards.
+"""
+
+import json
+from bitboard import move_name
+
+
+class SearchStats():
+    """ A class to record what happened during one search.
+
+    Attributes
+    ----------
+    algorithm : str
+        'minimax' or 'alpha_beta'
+    score : float
+        the best score found
+    depth : int
+        the depth of the deepest finished search
+    best_move : str
+        the move chosen in coordinate notation, like 'e2e4' (None if the
+        player has no moves)
+    pv : list
+        the principal variation, the moves both players are expected to
+        make, in coordinate notation
+    nodes : int
+        the positions visited, including quiescence positions
+    q_nodes : int
+        the positions visited by the quiescence search
+    cutoffs : int
+        the beta cutoffs of the alpha-beta search
+    first_cutoffs : int
+        the cutoffs caused by the first move searched
+    researches : int
+        the zero window and aspiration searches that were searched again
+    tt_probes : int
+        the transposition table lookups
+    tt_hits : int
+        the lookups that found the position
+    elapsed : float
+        seconds the search took
+    ponder_hit : bool
+        True if the search started from a ponder search of the position
+    depths : list
+        nodes, quiescence nodes, seconds and principal variation of each
+        finished depth
+
+    Methods
+    -------
+    add_depth(depth, nodes, q_nodes, seconds, pv=())
+        records a finished depth of the search
+    set_move(move)
+        records the chosen move
+    set_pv(pv)
+        records the principal variation
+    to_dict()
+        returns the statistics as a dictionary
+    write(stream)
+        writes the statistics as a JSON line
+    """
+
+    def __init__(self, algorithm):
+        """
+        Parameters
+        ----------
+        algorithm : str
+            'minimax' or 'alpha_beta'
+        """
+
+        self.algorithm = algorithm
+        self.score = None
+        self.depth = 0
+        self.best_move = None
+        self.pv = []
+
+        self.nodes = 0
+        self.q_nodes = 0
+        self.cutoffs = 0
+        self.first_cutoffs = 0
+        self.researches = 0
+        self.tt_probes = 0
+        self.tt_hits = 0
+
+        self.elapsed = 0.0
+        self.ponder_hit = False
+        self.depths = []
+
+    @property
+    def nps(self):
+        """ float: nodes searched per second. """
+
+        return self.nodes / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def branching_factor(self):
+        """ float: the effective branching factor of the search.
+
+        With more than one finished depth, it is the ratio of the nodes
+        of the last two depths. Otherwise it is the depth root of the nodes.
+        """
+
+        if len(self.depths) > 1 and self.depths[-2]['nodes']:
+            return self.depths[-1]['nodes'] / self.depths[-2]['nodes']
+        if self.depth and self.nodes:
+            return self.nodes ** (1 / self.depth)
+        return 0.0
+
+    @property
+    def first_cutoff_rate(self):
+        """ float: the share of cutoffs caused by the first move searched. """
+
+        return self.first_cutoffs / self.cutoffs if self.cutoffs else 0.0
+
+    @property
+    def tt_hit_rate(self):
+        """ float: the share of transposition table lookups that were found. """
+
+        return self.tt_hits / self.tt_probes if self.tt_probes else 0.0
+
+    def add_depth(self, depth, nodes, q_nodes, seconds, pv=()):
+        """ Records a finished depth of the search.
+
+        Parameters
+        ----------
+        depth : int
+            how many moves the search looked ahead
+        nodes : int
+            the positions visited at the depth
+        q_nodes : int
+            the quiescence positions visited at the depth
+        seconds : float
+            the time the depth took
+        pv : list, optional
+            the packed moves of the principal variation at the depth
+            (default is ())
+        """
+
+        self.depths.append({'depth': depth, 'nodes': nodes, 'q_nodes': q_nodes, \
+            'seconds': round(seconds, 6), 'pv': [move_name(move) for move in pv]})
+
+    def set_move(self, move):
+        """ Records the chosen move.
+
+        Parameters
+        ----------
+        move : int
+            the move packed by bitboard.encode_move, None if there was no move
+        """
+
+        self.best_move = None if move is None else move_name(move)
+
+    def set_pv(self, pv):
+        """ Records the principal variation.
+
+        Parameters
+        ----------
+        pv : list
+            the moves packed by bitboard.encode_move
+        """
+
+        self.pv = [move_name(move) for move in pv]
+
+    def to_dict(self):
+        """ Gets the statistics as a dictionary.
+
+        Returns
+        -------
+        dict
+            the counts and the rates calculated from them
+        """
+
+        score = self.score
+        if score is not None and abs(score) == float('inf'):
+            score = str(score)  #JSON has no infinity
+
+        return {
+            'algorithm': self.algorithm,
+            'score': score,
+            'depth': self.depth,
+            'best_move': self.best_move,
+            'pv': self.pv,
+            'nodes': self.nodes,
+            'q_nodes': self.q_nodes,
+            'nps': round(self.nps, 1),
+            'branching_factor': round(self.branching_factor, 3),
+            'cutoffs': self.cutoffs,
+            'first_cutoff_rate': round(self.first_cutoff_rate, 4),
+            'researches': self.researches,
+            'tt_hit_rate': round(self.tt_hit_rate, 4),
+            'elapsed': round(self.elapsed, 6),
+            'ponder_hit': self.ponder_hit,
+            'depths': self.depths,
+        }
+
+    def write(self, stream):
+        """ Writes the statistics as one JSON line.
+
+        Parameters
+        ----------
+        stream : file object
+            an open text file or stream
+        """
+
+        stream.write(json.dumps(self.to_dict()) + '\n')
+        stream.flush()
+
+    def __str__(self):
+        return '{} depth {} move {} score {}: {} nodes ({} quiescence) in {:.3f}s, ' \
+            '{:.0f} nps, branching {:.2f}, first move cutoffs {:.0%}, TT hits {:.0%}, pv {}' \
+            .format(self.algorithm, self.depth, self.best_move, self.score, self.nodes, \
+            self.q_nodes, self.elapsed, self.nps, self.branching_factor, \
+            self.first_cutoff_rate, self.tt_hit_rate, ' '.join(self.pv))
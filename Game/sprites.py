@@ -0,0 +1,63 @@
+""" Shared sprites for drawing the pieces with pygame.
+
+Each piece image is loaded, scaled and converted once per process and
+then shared by every piece of the same type and color, so building
+boards does not touch the disk and captured pieces never change a
+surface that other pieces use.
+"""
+
+import os
+import pygame
+
+#The piece images are kept next to the Game folder
+IMAGE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'Images')
+
+
+class SpriteCache():
+    """ A class to load each piece image once and share it.
+
+    Methods
+    -------
+    get(piece, size)
+        returns the sprite for the type and color of a piece
+    clear()
+        forgets every loaded sprite
+    """
+
+    def __init__(self):
+        self.sprites = {}   #(piece type, white, size) to pygame.Surface
+
+    def get(self, piece, size):
+        """ Gets the sprite for the type and color of a piece.
+
+        Parameters
+        ----------
+        piece : obj (depends on the child class)
+            the piece that is being drawn
+        size : int
+            width and height of a board space in pixels
+
+        Returns
+        -------
+        pygame.Surface
+            the scaled image as a transparent surface
+        """
+
+        key = (piece.get_type(), piece.white, size)
+        sprite = self.sprites.get(key)
+
+        if sprite is None:
+            load_image = pygame.image.load(os.path.join(IMAGE_DIR, piece.images[piece.white]))
+            scale_image = pygame.transform.scale(load_image, (size, size))
+            sprite = scale_image.convert_alpha()    #The image as a transparent rectangle
+            self.sprites[key] = sprite
+
+        return sprite
+
+    def clear(self):
+        """ Forgets every loaded sprite, needed if the display is recreated. """
+
+        self.sprites.clear()
+
+
+SPRITES = SpriteCache()     #Shared by every game in the process
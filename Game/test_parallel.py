@@ -0,0 +1,62 @@
+""" Regression tests for the parallel root search.
+
+Run from the Game folder with:
+    python -m unittest test_parallel
+"""
+
+import os
+import sys
+import time
+import unittest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [HERE, os.path.join(HERE, '..', 'Pieces')]
+
+from board import Board
+from parallel import ParallelSearch
+from errors import SearchTimeout
+
+FEN = 'r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w - - 0 3'
+DEEP_FEN = 'r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w - - 0 1'
+
+
+class ParallelSearchTest(unittest.TestCase):
+    """ Tests of ParallelSearch used as the search of iterative deepening. """
+
+    def test_iterative_deepening(self):
+        """ The young brothers of every depth search with integer windows. """
+
+        board = Board.from_fen(FEN)
+        with ParallelSearch(2, seed=1) as parallel:
+            score, depth = parallel.ai.iterative_deepening(True, 1000, board, \
+                search=parallel.search)
+
+        self.assertGreaterEqual(depth, 2)
+        self.assertIsInstance(score, int)
+        self.assertEqual(parallel.ai.best_move, parallel.best_move)
+        self.assertIn(parallel.best_move, board.legal_moves(True))
+        self.assertEqual(board.to_fen(), FEN)
+
+    def test_deadline(self):
+        """ The workers stop with the deadline instead of finishing the depth. """
+
+        board = Board.from_fen(DEEP_FEN)
+        with ParallelSearch(2, seed=1) as parallel:
+            parallel.search(True, 2, board)     #The workers are started
+
+            start = time.perf_counter()
+            parallel.ai.deadline = start + 0.3
+            with self.assertRaises(SearchTimeout):
+                parallel.search(True, 6, board)
+            elapsed = time.perf_counter() - start
+
+        #Like iterative_deepening, undo the moves of the stopped search
+        while board.history:
+            board.unmake_move()
+
+        self.assertLess(elapsed, 0.6)
+        self.assertEqual(board.to_fen(), DEEP_FEN)
+
+
+if __name__ == '__main__':
+    unittest.main()
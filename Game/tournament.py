@@ -0,0 +1,279 @@
+""" Headless self-play tournaments between two engine settings.
+
+The games are played without a window across a pool of worker processes,
+one game per task, and every finished game is written to a results file
+as one JSON line with the result, the moves and the time of each move.
+
+    python tournament.py --games 100 --a depth=3 --b depth=3,q_budget=0
+    python tournament.py --games 20 --a algorithm=minimax,depth=2 --b time_budget=200
+    python tournament.py --games 20 --a time_budget=200 --b time_budget=200,pvs=0
+    python tournament.py --games 20 --a depth=5 --b depth=5,null_move=0,lmr=0
+"""
+
+import argparse
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from board import Board
+from ai_versions import AIVersions
+
+
+class EngineConfig():
+    """ A class to describe the settings of an engine in a tournament.
+
+    Attributes
+    ----------
+    name : str
+        the name of the engine in the results
+    algorithm : str
+        'alpha_beta' or 'minimax'
+    depth : int
+        how many moves the AI looks ahead, or the deepest search with a
+        budget (None for the AIVersions.search default, 3 without a
+        budget and 64 with one)
+    time_budget : int
+        milliseconds for each move with iterative deepening (None for a
+        fixed depth search)
+    tt_size_mb : int
+        memory for the transposition table in megabytes, 0 turns it off
+    ordering : bool
+        sort the alpha-beta moves before searching them
+    q_budget : int
+        the most quiescence positions each search may visit, 0 turns
+        quiescence off
+    pvs : bool
+        use principal variation search and aspiration windows
+    null_move : bool
+        use null move pruning
+    lmr : bool
+        use late move reductions
+
+    Methods
+    -------
+    from_spec(spec, name)
+        returns a config from a 'key=value,key=value' string
+    make_ai(seed)
+        returns an AIVersions with the settings
+    to_dict()
+        returns the settings as a dictionary
+    """
+
+    def __init__(self, name='engine', algorithm='alpha_beta', depth=None, time_budget=None, \
+        tt_size_mb=16, ordering=True, q_budget=50000, pvs=True, null_move=True, lmr=True):
+
+        if algorithm not in ('alpha_beta', 'minimax'):
+            raise ValueError('algorithm must be alpha_beta or minimax, not {}'.format(algorithm))
+
+        self.name = name
+        self.algorithm = algorithm
+        self.depth = depth
+        self.time_budget = time_budget
+        self.tt_size_mb = tt_size_mb
+        self.ordering = ordering
+        self.q_budget = q_budget
+        self.pvs = pvs
+        self.null_move = null_move
+        self.lmr = lmr
+
+    @classmethod
+    def from_spec(cls, spec, name='engine'):
+        """ Creates a config from a 'key=value,key=value' string.
+
+        Parameters
+        ----------
+        spec : str
+            settings like 'algorithm=minimax,depth=2' or 'time_budget=200,ordering=0'
+        name : str, optional
+            the name used when the spec has no name (default is 'engine')
+
+        Returns
+        -------
+        tournament.EngineConfig
+            the config with the settings, defaults for the rest
+
+        Raises
+        ------
+        ValueError
+            If a setting is unknown or its value is not valid.
+        """
+
+        settings = {'name': name}
+        switch = lambda value: value not in ('0', 'false', 'False')
+        types = {'name': str, 'algorithm': str, 'depth': int, 'time_budget': int, \
+            'tt_size_mb': int, 'ordering': switch, 'q_budget': int, 'pvs': switch, \
+            'null_move': switch, 'lmr': switch}
+
+        for item in filter(None, spec.split(',')):
+            key, _, value = item.partition('=')
+            if key not in types:
+                raise ValueError('unknown engine setting {}'.format(key))
+            settings[key] = types[key](value)
+
+        return cls(**settings)
+
+    def make_ai(self, seed=None):
+        """ Creates an AI with the settings.
+
+        Parameters
+        ----------
+        seed : int, optional
+            seed for breaking ties between equally ordered moves (default is None)
+
+        Returns
+        -------
+        ai_versions.AIVersions
+            the AI for one game
+        """
+
+        return AIVersions(self.tt_size_mb, self.ordering, seed, self.q_budget, pvs=self.pvs, \
+            null_move=self.null_move, lmr=self.lmr)
+
+    def to_dict(self):
+        """ Gets the settings as a dictionary.
+
+        Returns
+        -------
+        dict
+            every setting of the config
+        """
+
+        return dict(vars(self))
+
+
+def play_game(game_id, white, black, max_moves=200, seed=None):
+    """ Plays one game without a window.
+
+    Parameters
+    ----------
+    game_id : int
+        number of the game in the tournament
+    white : tournament.EngineConfig
+        settings of the white player
+    black : tournament.EngineConfig
+        settings of the black player
+    max_moves : int, optional
+        moves of both players before the game is a draw (default is 200)
+    seed : int, optional
+        seed for breaking ties, so the game can be replayed (default is None)
+
+    Returns
+    -------
+    dict
+        the players, winner ('white', 'black' or 'draw'), reason, moves and
+        the seconds each move took
+    """
+
+    random.seed(seed)   #Moves are shuffled with the random module when not ordered
+    board = Board()
+    engines = {True: (white, white.make_ai(seed)), False: (black, black.make_ai(seed))}
+
+    player = True
+    moves, move_times, nodes = [], [], {'white': 0, 'black': 0}
+    winner, reason = 'draw', 'move limit'
+
+    while len(moves) < max_moves:
+        config, ai = engines[player]
+        stats = ai.search(player, board, config.depth, config.time_budget, \
+            minimax=config.algorithm == 'minimax')
+
+        move_times.append(round(stats.elapsed, 6))
+        nodes['white' if player else 'black'] += stats.nodes
+
+        #The player has no legal moves
+        if ai.best_move is None:
+            if board.in_check(player)[0]:
+                winner, reason = 'black' if player else 'white', 'checkmate'
+            else:
+                reason = 'stalemate'
+            break
+
+        moves.append(stats.best_move)
+        board.make_move(ai.best_move)
+        player = not player
+
+    return {
+        'game': game_id,
+        'white': white.name,
+        'black': black.name,
+        'winner': winner,
+        'reason': reason,
+        'moves': len(moves),
+        'move_list': moves,
+        'move_times': move_times,
+        'nodes': nodes,
+        'seed': seed,
+    }
+
+def run_tournament(engine_a, engine_b, games, results_path, workers=None, max_moves=200, seed=0):
+    """ Plays a tournament between two engines across a process pool.
+
+    The engines switch colors every game. Each game is written to the
+    results file as soon as it finishes, so a long run can be followed
+    while it plays.
+
+    Parameters
+    ----------
+    engine_a : tournament.EngineConfig
+        the first engine, white in the even games
+    engine_b : tournament.EngineConfig
+        the second engine, white in the odd games
+    games : int
+        the number of games to play
+    results_path : str
+        file the results are appended to as JSON lines
+    workers : int, optional
+        the number of worker processes (default is the number of cores)
+    max_moves : int, optional
+        moves of both players before a game is a draw (default is 200)
+    seed : int, optional
+        seed of the first game, game i uses seed + i (default is 0)
+
+    Returns
+    -------
+    dict
+        the wins of each engine and the draws
+    """
+
+    score = {engine_a.name: 0, engine_b.name: 0, 'draw': 0}
+    start = time.perf_counter()
+
+    with ProcessPoolExecutor(workers or os.cpu_count()) as pool, \
+        open(results_path, 'a') as results:
+
+        futures = []
+        for game_id in range(games):
+            white, black = (engine_a, engine_b) if game_id % 2 == 0 else (engine_b, engine_a)
+            futures.append(pool.submit(play_game, game_id, white, black, max_moves, seed + game_id))
+
+        for future in as_completed(futures):
+            result = future.result()
+            results.write(json.dumps(result) + '\n')
+            results.flush()
+
+            winner = result['winner']
+            score[winner if winner == 'draw' else result[winner]] += 1
+
+            print('game {:>4}: {} vs {}, {} ({}, {} moves)'.format(result['game'], \
+                result['white'], result['black'], winner, result['reason'], result['moves']))
+
+    print('\n{}: {}  {}: {}  draws: {}  ({:.1f}s)'.format(engine_a.name, score[engine_a.name], \
+        engine_b.name, score[engine_b.name], score['draw'], time.perf_counter() - start))
+
+    return score
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Self-play tournament between two engines.')
+    parser.add_argument('--a', default='', help="settings of engine A, like 'depth=3,q_budget=0'")
+    parser.add_argument('--b', default='', help='settings of engine B')
+    parser.add_argument('--games', type=int, default=10, help='number of games to play')
+    parser.add_argument('--workers', type=int, help='worker processes (default is every core)')
+    parser.add_argument('--max-moves', type=int, default=200, help='moves before a draw')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the first game')
+    parser.add_argument('--out', default='results.jsonl', help='results file (JSON lines)')
+    args = parser.parse_args()
+
+    run_tournament(EngineConfig.from_spec(args.a, 'A'), EngineConfig.from_spec(args.b, 'B'), \
+        args.games, args.out, args.workers, args.max_moves, args.seed)
@@ -0,0 +1,326 @@
+""" A fixed size transposition table for the alpha-beta search.
+
+The table is a set of flat typed arrays, so its memory use is fixed when
+it is created and never grows during a game. Entries are grouped in
+buckets of two slots: the first slot keeps the deepest search of the
+current game move (depth-preferred) and the second slot always takes the
+newest entry (always-replace).
+
+SharedTranspositionTable keeps the same buckets in shared memory, so the
+searches of several processes can use each other's results.
+"""
+
+from array import array
+from multiprocessing import shared_memory
+
+#Bound types of a stored score
+EXACT = 0   #The score is the real score of the position
+LOWER = 1   #The real score is at least the stored score (fail high)
+UPPER = 2   #The real score is at most the stored score (fail low)
+
+NO_MOVE = 0     #from square 0 to square 0 is never a move
+
+#Bytes used by one slot: key (8), score (4), move (2), depth, bound, age (1 each)
+SLOT_BYTES = 17
+
+#Bytes used by one shared slot: key XOR data (8), data (8)
+SHARED_SLOT_BYTES = 16
+SCORE_OFFSET = 1 << 31  #Scores are stored unsigned in the shared data word
+
+
+class TranspositionTable():
+    """ A class to store the results of searched positions by Zobrist key.
+
+    Attributes
+    ----------
+    size_mb : int
+        the memory the table may use in megabytes
+    buckets : int
+        the number of two slot buckets in the table
+    age : int
+        the current search, entries from older searches are replaced first
+
+    Methods
+    -------
+    new_search()
+        starts a new search so old entries can be replaced
+    clear()
+        empties the table
+    probe(key)
+        returns the stored (depth, score, bound, move) for a key
+    store(key, depth, score, bound, move)
+        stores a searched position with the replacement policy
+    """
+
+    def __init__(self, size_mb=16):
+        """
+        Parameters
+        ----------
+        size_mb : int, optional
+            the memory the table may use in megabytes (default is 16)
+        """
+
+        self.size_mb = size_mb
+        self.buckets = max(1, size_mb * 1024 * 1024 // (2 * SLOT_BYTES))
+        self.age = 0
+
+        slots = 2 * self.buckets
+        self.keys = array('Q', bytes(8 * slots))
+        self.scores = array('i', bytes(4 * slots))
+        self.moves = array('H', bytes(2 * slots))
+        self.depths = array('b', bytes(slots))
+        self.bounds = array('B', bytes(slots))
+        self.ages = array('B', bytes(slots))
+
+        self.hits = 0       #probes that found the key
+        self.probes = 0     #all probes
+
+    def new_search(self):
+        """ Starts a new search so entries from old searches are replaced. """
+
+        self.age = (self.age + 1) & 255
+
+    def clear(self):
+        """ Empties the table without changing its size. """
+
+        slots = 2 * self.buckets
+        self.keys = array('Q', bytes(8 * slots))
+        self.depths = array('b', bytes(slots))
+        self.hits = 0
+        self.probes = 0
+
+    def probe(self, key):
+        """ Looks up a position in the table.
+
+        Parameters
+        ----------
+        key : int
+            the Zobrist key of the position
+
+        Returns
+        -------
+        tuple
+            (depth, score, bound, move) of the stored search, or None if
+            the position is not in the table
+        """
+
+        self.probes += 1
+        slot = 2 * (key % self.buckets)
+
+        #Check the depth-preferred slot and then the always-replace slot
+        if self.keys[slot] != key:
+            slot += 1
+            if self.keys[slot] != key:
+                return None
+
+        self.hits += 1
+        return self.depths[slot], self.scores[slot], self.bounds[slot], self.moves[slot]
+
+    def store(self, key, depth, score, bound, move=NO_MOVE):
+        """ Stores a searched position.
+
+        The depth-preferred slot is replaced when it is from an older
+        search, holds the same position, or was searched less deeply.
+        Otherwise the entry goes in the always-replace slot.
+
+        Parameters
+        ----------
+        key : int
+            the Zobrist key of the position
+        depth : int
+            how many moves were searched below the position
+        score : int
+            the score found for the position
+        bound : int
+            EXACT, LOWER or UPPER
+        move : int, optional
+            the best move packed by bitboard.encode_move (default is NO_MOVE)
+        """
+
+        slot = 2 * (key % self.buckets)
+
+        if self.ages[slot] == self.age and self.keys[slot] != key \
+            and self.depths[slot] > depth:
+            slot += 1   #Keep the deeper search and use the always-replace slot
+
+        #Keep the old best move if this search did not find one
+        if move == NO_MOVE and self.keys[slot] == key:
+            move = self.moves[slot]
+
+        self.keys[slot] = key
+        self.depths[slot] = depth
+        self.scores[slot] = score
+        self.bounds[slot] = bound
+        self.moves[slot] = move
+        self.ages[slot] = self.age
+
+
+class SharedTranspositionTable():
+    """ A class to share a transposition table between processes.
+
+    The table is one flat array of 64-bit words in shared memory. Each
+    slot has a data word, which packs the score, move, depth, bound and
+    age, and a check word, which is the key XOR the data. No locks are
+    used: a slot that is read while another process writes it does not
+    pass the check, so it is treated as missing instead of being used
+    with the wrong data.
+
+    The age is kept in the shared memory too, after the slots, and only
+    the process that created the table starts new searches, so every
+    process agrees on which entries belong to the current search.
+
+    Attributes
+    ----------
+    size_mb : int
+        the memory the table uses in megabytes
+    buckets : int
+        the number of two slot buckets in the table
+    age : int
+        the current search, entries from older searches are replaced first
+        (read from the shared memory)
+    name : str
+        name of the shared memory, used to attach from other processes
+
+    Methods
+    -------
+    new_search()
+        starts a new search so old entries can be replaced, in the
+        creating process only
+    clear()
+        empties the table
+    probe(key)
+        returns the stored (depth, score, bound, move) for a key
+    store(key, depth, score, bound, move)
+        stores a searched position with the replacement policy
+    close()
+        detaches from the shared memory, and frees it in the creating process
+    """
+
+    def __init__(self, size_mb=16, name=None):
+        """
+        Parameters
+        ----------
+        size_mb : int, optional
+            the memory the table uses in megabytes, must match the table
+            being attached to (default is 16)
+        name : str, optional
+            name of an existing table to attach to (default is None, which
+            creates a new table)
+        """
+
+        self.size_mb = size_mb
+        self.buckets = max(1, size_mb * 1024 * 1024 // (2 * SHARED_SLOT_BYTES))
+
+        size = 2 * self.buckets * SHARED_SLOT_BYTES + 8     #The age word follows the slots
+        self.owner = name is None
+        if self.owner:
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+            self.shm.buf[:size] = bytes(size)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.name = self.shm.name
+
+        self.words = self.shm.buf[:size].cast('Q')   #[check, data] for each slot, then the age
+        self._age_word = 4 * self.buckets
+
+        self.hits = 0       #probes that found the key
+        self.probes = 0     #all probes
+
+    @property
+    def age(self):
+        """ int: the current search, shared by every process. """
+
+        return self.words[self._age_word]
+
+    def new_search(self):
+        """ Starts a new search so entries from old searches are replaced.
+
+        Only the creating process starts searches, the other processes
+        search for it and keep its age.
+        """
+
+        if self.owner:
+            self.words[self._age_word] = (self.age + 1) & 63
+
+    def clear(self):
+        """ Empties the table for every process without changing its size or age. """
+
+        size = 2 * self.buckets * SHARED_SLOT_BYTES
+        self.shm.buf[:size] = bytes(size)
+        self.hits = 0
+        self.probes = 0
+
+    def probe(self, key):
+        """ Looks up a position in the table.
+
+        Parameters
+        ----------
+        key : int
+            the Zobrist key of the position
+
+        Returns
+        -------
+        tuple
+            (depth, score, bound, move) of the stored search, or None if
+            the position is not in the table
+        """
+
+        self.probes += 1
+        words = self.words
+        slot = 4 * (key % self.buckets)
+
+        #Check the depth-preferred slot and then the always-replace slot
+        data = words[slot + 1]
+        if words[slot] ^ data != key:
+            slot += 2
+            data = words[slot + 1]
+            if words[slot] ^ data != key:
+                return None
+
+        self.hits += 1
+        return data >> 8 & 255, (data >> 32) - SCORE_OFFSET, data >> 6 & 3, data >> 16 & 0xFFFF
+
+    def store(self, key, depth, score, bound, move=NO_MOVE):
+        """ Stores a searched position.
+
+        Uses the same replacement policy as TranspositionTable.store.
+
+        Parameters
+        ----------
+        key : int
+            the Zobrist key of the position
+        depth : int
+            how many moves were searched below the position
+        score : int
+            the score found for the position
+        bound : int
+            EXACT, LOWER or UPPER
+        move : int, optional
+            the best move packed by bitboard.encode_move (default is NO_MOVE)
+        """
+
+        words = self.words
+        slot = 4 * (key % self.buckets)
+        data = words[slot + 1]
+        age = words[self._age_word]
+
+        if data & 63 == age and words[slot] ^ data != key \
+            and data >> 8 & 255 > depth:
+            slot += 2   #Keep the deeper search and use the always-replace slot
+            data = words[slot + 1]
+
+        #Keep the old best move if this search did not find one
+        if move == NO_MOVE and words[slot] ^ data == key:
+            move = data >> 16 & 0xFFFF
+
+        data = (score + SCORE_OFFSET) << 32 | move << 16 | depth << 8 | bound << 6 | age
+        words[slot + 1] = data
+        words[slot] = key ^ data
+
+    def close(self):
+        """ Detaches from the shared memory, the creating process also frees it. """
+
+        self.words.release()
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
@@ -0,0 +1,54 @@
+""" Zobrist keys used to hash chess positions into 64-bit integers.
+
+Every (team, piece kind, square) has a random key, as do Pawns that can
+still make their two space first move and the black side to move. The key
+of a position is the XOR of the keys of everything in it, so a move only
+needs to XOR out what changed and XOR in what is new.
+
+The keys come from a fixed seed, so every process builds the same table
+and the hashes of a position can be shared between them.
+"""
+
+import random
+
+_rng = random.Random(20201)     #Fixed seed for the same keys in every run
+
+#Piece keys indexed [white][kind][square]
+PIECE_KEYS = [[[_rng.getrandbits(64) for sq in range(64)] for kind in range(6)] \
+    for white in range(2)]
+
+FIRST_MOVE_KEYS = [_rng.getrandbits(64) for sq in range(64)]   #Pawn can move two spaces
+BLACK_TO_MOVE = _rng.getrandbits(64)    #XOR in when it is the black player's turn
+
+
+def board_key(board_obj):
+    """ Calculates the Zobrist key of a board from scratch.
+
+    The board keeps its key up to date as moves are made, so this
+    is only needed when a board is set up.
+
+    Parameters
+    ----------
+    board_obj : board.Board
+        the board object that was created
+
+    Returns
+    -------
+    int
+        the 64-bit key of the position
+    """
+
+    key = 0
+
+    for sq, piece in enumerate(board_obj.squares):
+        if piece is not None:
+            key ^= PIECE_KEYS[piece.white][piece.kind][sq]
+
+            #Pawns that have not moved yet play differently
+            if getattr(piece, 'first_move', False):
+                key ^= FIRST_MOVE_KEYS[sq]
+
+    if not board_obj.white_turn:
+        key ^= BLACK_TO_MOVE
+
+    return key
@@ -0,0 +1,197 @@
+""" Attack tables for every piece, built once when the module is imported.
+
+Knight, King and Pawn attacks only depend on the starting square, so they
+are stored as one bitboard per square. Sliding pieces use ray tables: each
+square has one ray bitboard per direction, and the first occupied square on
+a ray is found with a bit scan, so the ray beyond the blocker can be masked
+off with the blocker's own ray. Move generation is a table lookup plus
+masking against the occupancy bitboards.
+"""
+
+from bitboard import lsb
+
+#(x, y) steps of each ray, y grows towards the bottom of the board.
+#Rays with a positive square step come first so the nearest blocker
+#is the lowest set bit, the others need the highest set bit.
+EAST, SOUTH, SOUTH_EAST, SOUTH_WEST, WEST, NORTH, NORTH_WEST, NORTH_EAST = range(8)
+DIRECTIONS = [(1, 0), (0, 1), (1, 1), (-1, 1), (-1, 0), (0, -1), (-1, -1), (1, -1)]
+
+ROOK_DIRECTIONS = (EAST, SOUTH, WEST, NORTH)
+BISHOP_DIRECTIONS = (SOUTH_EAST, SOUTH_WEST, NORTH_WEST, NORTH_EAST)
+
+KNIGHT_STEPS = [(1, 2), (2, 1), (2, -1), (1, -2), (-1, -2), (-2, -1), (-2, 1), (-1, 2)]
+
+
+def _jump_table(steps):
+    """ Builds the attack bitboard of a single step piece on every square.
+
+    Parameters
+    ----------
+    steps : list
+        (x, y) offsets the piece can move to
+
+    Returns
+    -------
+    list
+        attack bitboard for each of the 64 squares
+    """
+
+    table = []
+    for sq in range(64):
+        x, y = sq & 7, sq >> 3
+        bb = 0
+        for dx, dy in steps:
+            if 0 <= x + dx < 8 and 0 <= y + dy < 8:
+                bb |= 1 << ((y + dy) * 8 + x + dx)
+        table.append(bb)
+    return table
+
+def _ray_table():
+    """ Builds the ray bitboards for every direction and square.
+
+    Returns
+    -------
+    list
+        rays indexed [direction][square], the square itself is not included
+    """
+
+    table = []
+    for dx, dy in DIRECTIONS:
+        rays = []
+        for sq in range(64):
+            x, y = (sq & 7) + dx, (sq >> 3) + dy
+            bb = 0
+            while 0 <= x < 8 and 0 <= y < 8:
+                bb |= 1 << (y * 8 + x)
+                x += dx
+                y += dy
+            rays.append(bb)
+        table.append(rays)
+    return table
+
+def _between_table(rays):
+    """ Builds the bitboards of the spaces between two squares on a line.
+
+    Parameters
+    ----------
+    rays : list
+        rays indexed [direction][square]
+
+    Returns
+    -------
+    list
+        spaces strictly between the squares indexed [square][square], 0
+        if the squares are not on the same row, column or diagonal
+    """
+
+    table = [[0] * 64 for sq in range(64)]
+    for d in range(8):
+        for sq in range(64):
+            ray = rays[d][sq]
+            for other in range(64):
+                if ray >> other & 1:
+                    #The ray up to the other square, without the square itself
+                    table[sq][other] = ray & ~rays[d][other] & ~(1 << other)
+    return table
+
+
+KNIGHT_ATTACKS = _jump_table(KNIGHT_STEPS)
+KING_ATTACKS = _jump_table([(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1) if dx or dy])
+
+#Pawn captures indexed [white][square], white pawns capture towards y = 0
+PAWN_ATTACKS = [_jump_table([(-1, 1), (1, 1)]), _jump_table([(-1, -1), (1, -1)])]
+
+RAYS = _ray_table()
+
+#Spaces that block a check or stay inside a pin, indexed [square][square]
+BETWEEN = _between_table(RAYS)
+
+
+def slide_attacks(sq, occupied, directions):
+    """ Gets the spaces a sliding piece attacks from a square.
+
+    Each ray stops at the first occupied space, which is included so
+    that captures can be found by masking with the enemy pieces.
+
+    Parameters
+    ----------
+    sq : int
+        the square of the sliding piece
+    occupied : int
+        bitboard of all the spaces used by both teams
+    directions : tuple
+        the ray directions the piece can move in
+
+    Returns
+    -------
+    int
+        bitboard of the attacked spaces
+    """
+
+    attacks = 0
+    for d in directions:
+        ray = RAYS[d][sq]
+        blockers = ray & occupied
+        if blockers:
+            #Positive rays are blocked by the lowest bit, negative by the highest
+            if d < WEST:
+                blocker = lsb(blockers)
+            else:
+                blocker = blockers.bit_length() - 1
+            ray ^= RAYS[d][blocker]   #Remove the spaces behind the blocker
+        attacks |= ray
+    return attacks
+
+def rook_attacks(sq, occupied):
+    """ Gets the spaces a Rook attacks from a square.
+
+    Parameters
+    ----------
+    sq : int
+        the square of the Rook
+    occupied : int
+        bitboard of all the spaces used by both teams
+
+    Returns
+    -------
+    int
+        bitboard of the attacked spaces
+    """
+
+    return slide_attacks(sq, occupied, ROOK_DIRECTIONS)
+
+def bishop_attacks(sq, occupied):
+    """ Gets the spaces a Bishop attacks from a square.
+
+    Parameters
+    ----------
+    sq : int
+        the square of the Bishop
+    occupied : int
+        bitboard of all the spaces used by both teams
+
+    Returns
+    -------
+    int
+        bitboard of the attacked spaces
+    """
+
+    return slide_attacks(sq, occupied, BISHOP_DIRECTIONS)
+
+def queen_attacks(sq, occupied):
+    """ Gets the spaces a Queen attacks from a square.
+
+    Parameters
+    ----------
+    sq : int
+        the square of the Queen
+    occupied : int
+        bitboard of all the spaces used by both teams
+
+    Returns
+    -------
+    int
+        bitboard of the attacked spaces
+    """
+
+    return slide_attacks(sq, occupied, range(8))